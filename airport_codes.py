@@ -0,0 +1,155 @@
+"""
+IATA airport codes for the cities used in route planning.
+
+Keyed by (country_code, city) so the same city name in two countries can never
+resolve to the wrong airport. Covers every city in utils.COUNTRY_MAJOR_CITIES plus
+a few extra cities that were previously mapped; add new cities here together with
+their COUNTRY_MAJOR_CITIES entry.
+"""
+
+AIRPORT_CODES = {
+    # Asia
+    ("IN", "Delhi"): "DEL",
+    ("IN", "Mumbai"): "BOM",
+    ("IN", "Hyderabad"): "HYD",
+    ("IN", "Bangalore"): "BLR",
+    ("AE", "Dubai"): "DXB",
+    ("AE", "Abu Dhabi"): "AUH",
+    ("SG", "Singapore"): "SIN",
+    ("TH", "Bangkok"): "BKK",
+    ("TH", "Phuket"): "HKT",
+    ("TR", "Istanbul"): "IST",
+    ("TR", "Ankara"): "ESB",
+    ("ID", "Jakarta"): "CGK",
+    ("ID", "Bali"): "DPS",
+    ("QA", "Doha"): "DOH",
+    ("MY", "Kuala Lumpur"): "KUL",
+    ("BD", "Dhaka"): "DAC",
+    ("LK", "Colombo"): "CMB",
+    ("MV", "Male"): "MLE",
+    ("CN", "Beijing"): "PEK",
+    ("CN", "Shanghai"): "PVG",
+    ("JP", "Tokyo"): "NRT",
+    ("JP", "Osaka"): "KIX",
+    ("KR", "Seoul"): "ICN",
+    ("PH", "Manila"): "MNL",
+    ("VN", "Ho Chi Minh City"): "SGN",
+    ("VN", "Hanoi"): "HAN",
+    ("SA", "Riyadh"): "RUH",
+    ("SA", "Jeddah"): "JED",
+    ("KW", "Kuwait City"): "KWI",
+    ("BH", "Manama"): "BAH",
+    ("OM", "Muscat"): "MCT",
+    ("LB", "Beirut"): "BEY",
+    ("AF", "Kabul"): "KBL",
+    ("KZ", "Almaty"): "ALA",
+    ("UZ", "Tashkent"): "TAS",
+    ("KG", "Bishkek"): "FRU",
+    ("TM", "Ashgabat"): "ASB",
+    ("MN", "Ulaanbaatar"): "ULN",
+    ("NP", "Kathmandu"): "KTM",
+
+    # Europe
+    ("DE", "Frankfurt"): "FRA",
+    ("DE", "Munich"): "MUC",
+    ("DE", "Berlin"): "BER",
+    ("FR", "Paris"): "CDG",
+    ("FR", "Lyon"): "LYS",
+    ("NL", "Amsterdam"): "AMS",
+    ("IT", "Rome"): "FCO",
+    ("IT", "Milan"): "MXP",
+    ("ES", "Madrid"): "MAD",
+    ("ES", "Barcelona"): "BCN",
+    ("GB", "London"): "LHR",
+    ("GB", "Manchester"): "MAN",
+    ("RU", "Moscow"): "SVO",
+    ("RU", "Saint Petersburg"): "LED",
+    ("AT", "Vienna"): "VIE",
+    ("BE", "Brussels"): "BRU",
+    ("CH", "Zurich"): "ZRH",
+    ("CH", "Geneva"): "GVA",
+    ("SE", "Stockholm"): "ARN",
+    ("NO", "Oslo"): "OSL",
+    ("DK", "Copenhagen"): "CPH",
+    ("FI", "Helsinki"): "HEL",
+    ("PL", "Warsaw"): "WAW",
+    ("PL", "Krakow"): "KRK",
+    ("CZ", "Prague"): "PRG",
+    ("HU", "Budapest"): "BUD",
+    ("GR", "Athens"): "ATH",
+    ("PT", "Lisbon"): "LIS",
+    ("RO", "Bucharest"): "OTP",
+    ("BG", "Sofia"): "SOF",
+    ("HR", "Zagreb"): "ZAG",
+    ("RS", "Belgrade"): "BEG",
+    ("BA", "Sarajevo"): "SJJ",
+    ("ME", "Podgorica"): "TGD",
+    ("SI", "Ljubljana"): "LJU",
+    ("MK", "Skopje"): "SKP",
+    ("AZ", "Baku"): "GYD",
+    ("GE", "Tbilisi"): "TBS",
+    ("MD", "Chisinau"): "KIV",
+    ("EE", "Tallinn"): "TLL",
+    ("LV", "Riga"): "RIX",
+    ("LT", "Vilnius"): "VNO",
+    ("LU", "Luxembourg"): "LUX",
+    ("MT", "Valletta"): "MLA",
+    ("IE", "Dublin"): "DUB",
+
+    # Africa
+    ("EG", "Cairo"): "CAI",
+    ("EG", "Alexandria"): "HBE",
+    ("KE", "Nairobi"): "NBO",
+    ("ZA", "Johannesburg"): "JNB",
+    ("ZA", "Cape Town"): "CPT",
+    ("MA", "Casablanca"): "CMN",
+    ("MA", "Marrakech"): "RAK",
+    ("TN", "Tunis"): "TUN",
+    ("DZ", "Algiers"): "ALG",
+    ("LY", "Tripoli"): "TIP",
+    ("ET", "Addis Ababa"): "ADD",
+    ("GH", "Accra"): "ACC",
+    ("NG", "Lagos"): "LOS",
+    ("NG", "Abuja"): "ABV",
+    ("SN", "Dakar"): "DKR",
+    ("CI", "Abidjan"): "ABJ",
+    ("CM", "Douala"): "DLA",
+    ("CD", "Kinshasa"): "FIH",
+    ("AO", "Luanda"): "LAD",
+    ("UG", "Kampala"): "EBB",
+    ("TZ", "Dar es Salaam"): "DAR",
+    ("RW", "Kigali"): "KGL",
+    ("MU", "Port Louis"): "MRU",
+    ("MG", "Antananarivo"): "TNR",
+
+    # North America
+    ("US", "New York"): "JFK",
+    ("US", "Los Angeles"): "LAX",
+    ("US", "Chicago"): "ORD",
+    ("US", "Miami"): "MIA",
+    ("US", "San Francisco"): "SFO",
+    ("US", "Washington DC"): "DCA",
+    ("US", "Seattle"): "SEA",
+    ("US", "Boston"): "BOS",
+    ("CA", "Toronto"): "YYZ",
+    ("CA", "Montreal"): "YUL",
+    ("CA", "Vancouver"): "YVR",
+    ("MX", "Mexico City"): "MEX",
+    ("MX", "Cancun"): "CUN",
+    ("CU", "Havana"): "HAV",
+    ("PA", "Panama City"): "PTY",
+
+    # South America
+    ("BR", "Sao Paulo"): "GRU",
+    ("BR", "Rio de Janeiro"): "GIG",
+    ("AR", "Buenos Aires"): "EZE",
+    ("CO", "Bogota"): "BOG",
+    ("CO", "Medellin"): "MDE",
+    ("CL", "Santiago"): "SCL",
+    ("VE", "Caracas"): "CCS",
+
+    # Oceania
+    ("AU", "Melbourne"): "MEL",
+    ("AU", "Sydney"): "SYD",
+    ("AU", "Perth"): "PER",
+}
@@ -9,16 +9,113 @@ This script:
 4. Prioritizes easy visa countries for Indian citizens
 """
 
-import json
+import orjson
 import time
 import sys
 import threading
 import os
+import bisect
+import itertools
+import queue
+import hashlib
+import functools
+import re
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from google_flights.google_flights import GoogleFlights
-from route_planner import generate_all_possible_combinations, print_route_summary
+from google_flights.flight import Flight
+from route_planner import best_route_combinations, print_route_summary
 from utils import COUNTRY_MAJOR_CITIES
+from airport_codes import AIRPORT_CODES
+
+_MAX_SEARCH_CANDIDATES = 10000  # Largest batch main() searches in one run
+_PROGRESS_SHARDS = 16  # Completed-route signatures are spread over this many progress shard files
+_IO_STOP = object()  # Sentinel telling the writer thread to exit
+_ROUTE_FAILED = object()  # search_route_flights result for a route to retry next run
+_RATE_LIMIT_BURST = 2  # Token bucket capacity: at most this many back-to-back requests
+_SCRAPE_RETRIES = 1  # Extra attempts for a segment search whose scrape failed
+_UNKNOWN_LEG_RATE = 0.5  # Success rate assumed for a segment never searched before
+_LEG_RATE_ALPHA = 0.3  # Weight of the latest search in a segment's success rate
+
+# Airline name variants accepted as Turkish Airlines ("tk" is the IATA code)
+_TURKISH_AIRLINES_NAMES = ("turkish airlines", "turkish", "thy", "tk")
+_AIRLINE_FILTER = "Turkish Airlines"  # Airline every scraper filters Google Flights results by
+
+# Deletes codeshare separators; a name that changes under it lists several airlines
+_CODESHARE_SEP_TABLE = str.maketrans("", "", ",/+")
+
+def _has_ist(flight):
+    """Check the structured airport fields of a flight for Istanbul (IST)"""
+    for key in ("route", "stops", "layovers"):
+        airports = flight.get(key)
+        if isinstance(airports, (list, tuple)) and "IST" in airports:
+            return True
+    return flight.get("origin") == "IST" or flight.get("destination") == "IST"
+
+def _stops_signature(stops):
+    """Hash (city, country_code, continent) triples into an order-independent 64-bit int"""
+    key = b"|".join(sorted(f"{city}\x1f{country_code}\x1f{continent}".encode() for city, country_code, continent in stops))
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+logger = logging.getLogger(__name__)
+
+def start_log_listener(level=logging.INFO):
+    """Send log records through a queue drained by one listener thread.
+    
+    Worker threads only enqueue records, so they never contend on the stdout lock.
+    The listener is stopped at interpreter exit, which flushes any pending records.
+    """
+    log_queue = queue.Queue(-1)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(level)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+def _write_json_atomic(path, data):
+    """Write data as indented JSON to a temp file, then atomically replace path with it"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, path)
+
+# Integer rupee amount in a price string such as "₹12,345"
+_PRICE_RE = re.compile(r"\d[\d,]*")
+_PRICE_UNKNOWN = sys.maxsize  # Sorts after every real price; only used for comparisons
+_PRICE_FALLBACK = 999999  # Cost counted for a flight whose price could not be parsed
+
+def _segment_flights(flight_results):
+    """All flights of a segment search: top/all flights, else any other list category"""
+    all_flights = []
+    
+    # Check both top_flights and all_flights keys
+    for key in ["top_flights", "all_flights"]:
+        flights = flight_results.get(key, [])
+        if flights:
+            all_flights.extend(flights)
+    
+    # If no flights in common keys, check all keys in the response
+    if not all_flights:
+        for key, value in flight_results.items():
+            if isinstance(value, list) and value:
+                all_flights.extend(value)
+    
+    return all_flights
+
+@functools.lru_cache(maxsize=1024)
+def _parse_price(price_str):
+    """Parse INR price string to int rupees (memoized - many flights share a price string)"""
+    match = _PRICE_RE.search(price_str) if price_str else None
+    if match is None:
+        return _PRICE_UNKNOWN
+    return int(match.group(0).replace(",", ""))
 
 def parse_date_input(date_str):
     """Parse various date input formats and return a datetime object"""
@@ -57,272 +154,499 @@ def date_to_short_format(date_obj):
     day = date_obj.day
     return f"{weekday}, {month} {day}"
 
+class TokenBucket:
+    """Thread-safe token bucket capping the aggregate request rate of all worker threads"""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate  # Tokens added per second
+        self.capacity = capacity  # Maximum burst size
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                # Waiters queue on the lock, so each one sleeps only for its own token
+                wait = (1 - self.tokens) / self.rate
+                time.sleep(wait)
+                self.tokens = 1.0
+                self.last = now + wait
+            self.tokens -= 1
+
 class TurkishAirlinesOptimizer:
+    __slots__ = (
+        "max_routes_to_search", "max_workers", "rate_limit_delay", "_rate_limiter",
+        "progress_file", "results_file", "results_log_file",
+        "departure_date_obj", "departure_date_short", "departure_date_google",
+        "progress_lock", "file_lock",
+        "completed_count", "failed_count", "discarded_count", "_sig_shards", "_dirty_shards",
+        "_sorted_results", "_result_seq", "_results_fh", "_io_queue", "_io_thread",
+        "segment_cache_file", "segment_cache_ttl", "segment_cache_negative_ttl", "_segment_cache", "_segment_inflight", "_segment_cache_lock", "_leg_table", "_dead_legs", "_failed_legs",
+        "leg_stats_file", "_leg_success",
+        "_pending_count", "_flush_threshold", "_flush_interval", "_dirty_since_flush", "_last_flush",
+    )
+    
     def __init__(self, headless=True, max_routes_to_search=20, max_workers=4, rate_limit_delay=2, 
                  progress_file="flight_search_progress.json", results_file="flight_search_results.json", 
-                 departure_date="2 Oct 2025"):
+                 departure_date="2 Oct 2025", segment_cache_file="flight_segment_cache.json",
+                 segment_cache_ttl=600, segment_cache_negative_ttl=60, rate_limiter=None,
+                 requests_per_second=None):
         self.max_routes_to_search = max_routes_to_search
         self.max_workers = max_workers  # Number of concurrent threads
-        self.rate_limit_delay = rate_limit_delay  # Delay between requests per thread
+        self.rate_limit_delay = rate_limit_delay  # Average seconds between requests per thread
+        # Enforced as one shared budget of requests_per_second, whatever max_workers is, unless
+        # the caller supplies a limiter shared with other optimizers. Without requests_per_second
+        # the budget falls back to max_workers / rate_limit_delay, which grows with the workers.
+        if rate_limiter is None:
+            if requests_per_second is None and rate_limit_delay > 0:
+                requests_per_second = max_workers / rate_limit_delay
+            if requests_per_second:
+                rate_limiter = TokenBucket(requests_per_second, _RATE_LIMIT_BURST)
+        self._rate_limiter = rate_limiter
         self.progress_file = progress_file  # File to track completed routes
-        self.results_file = results_file   # File to store all results
+        self.results_file = results_file   # Final sorted snapshot of all results
+        self.results_log_file = os.path.splitext(results_file)[0] + ".jsonl"  # Append-only results log
+        self.segment_cache_file = segment_cache_file  # Segment searches shared across routes and runs
+        self.segment_cache_ttl = segment_cache_ttl  # Seconds a segment search with flights stays valid
+        self.segment_cache_negative_ttl = segment_cache_negative_ttl  # Same for "no flights" answers
+        self.leg_stats_file = os.path.splitext(results_file)[0] + ".legs.json"  # Per-segment success rates
         
         # Parse and store departure date in multiple formats
         self.departure_date_obj = parse_date_input(departure_date)
         self.departure_date_short = date_to_short_format(self.departure_date_obj)  # "Thu, Oct 2"
         self.departure_date_google = date_to_google_flights_format(self.departure_date_obj)  # "October 2, 2025"
         
-        self.results = {}
-        self.results_lock = threading.Lock()  # Thread-safe results collection
         self.progress_lock = threading.Lock()  # Thread-safe progress tracking
-        self.file_lock = threading.Lock()     # Thread-safe file operations
+        self.file_lock = threading.Lock()     # Serializes the writer thread with finalize_results
         self.completed_count = 0
         self.failed_count = 0
-        self.completed_routes = set()  # Track completed route signatures
+        self.discarded_count = 0
+        # Completed route signatures, sharded by signature so a flush only rewrites dirty shards
+        self._sig_shards = [set() for _ in range(_PROGRESS_SHARDS)]
+        self._dirty_shards = set()
+        self._sorted_results = []  # (total_cost_inr, seq, result) tuples kept sorted by cost
+        self._result_seq = itertools.count()  # Tie-breaker so equal costs never compare dicts
+        self._segment_cache = {}  # (origin_code, dest_code, date, airline) -> (fetched_at, flight_results)
+        self._segment_inflight = {}  # Keys currently being searched -> Event set when done
+        self._segment_cache_lock = threading.Lock()
+        self._leg_table = {}  # Every segment search of this run (empty ones too), kept regardless of TTL
+        self._dead_legs = set()  # Leg table keys without a valid Turkish Airlines flight
+        self._failed_legs = set()  # Segment keys whose scrape kept failing this run (never cached)
+        self._leg_success = {}  # (origin_code, dest_code) -> smoothed share of searches with a valid flight
         
-        print(f"📅 Departure date configured: {departure_date} → {self.departure_date_short} (search) / {self.departure_date_google} (Google Flights)")
+        logger.info(f"📅 Departure date configured: {departure_date} → {self.departure_date_short} (search) / {self.departure_date_google} (Google Flights)")
         
         # Load existing progress on startup
         self.load_existing_progress()
+        self.load_segment_cache()
+        self.load_leg_stats()
+        
+        # Results are appended one JSON object per line; the handle stays open for the whole run
+        self._results_fh = self._open_results_log()
+        
+        # Progress file rewrites are debounced (see _io_worker)
+        self._flush_threshold = 16  # Rewrite after this many new completed routes...
+        self._flush_interval = 5.0  # ...or after this many seconds with unsaved completions
+        self._dirty_since_flush = 0
+        self._last_flush = time.monotonic()
         
-        # Note: We'll create GoogleFlights instances per thread to avoid conflicts
+        # All file I/O happens on one background thread; workers only enqueue
+        self._io_queue = queue.Queue(maxsize=1024)
+        self._io_thread = threading.Thread(target=self._io_worker, name="io-writer", daemon=True)
+        self._io_thread.start()
+        
+        self._pending_count = 0  # Routes queued for the current search_all_routes_parallel run
         
     def city_to_airport_code(self, city, country_code):
         """Convert city name to likely airport code for Google Flights"""
-        # Common airport mappings based on utils.py cities
-        airport_mapping = {
-            # Asia
-            "Delhi": "DEL",
-            "Mumbai": "BOM", 
-            "Hyderabad": "HYD",
-            "Bangalore": "BLR",
-            "Dubai": "DXB",
-            "Abu Dhabi": "AUH",
-            "Singapore": "SIN",
-            "Bangkok": "BKK",
-            "Phuket": "HKT",
-            "Istanbul": "IST",
-            "Ankara": "ESB",
-            "Jakarta": "CGK",
-            "Bali": "DPS",
-            "Doha": "DOH",
-            "Kuala Lumpur": "KUL",
-            "Dhaka": "DAC",
-            "Colombo": "CMB",
-            "Male": "MLE",
-            "Beijing": "PEK",
-            "Shanghai": "PVG",
-            "Tokyo": "NRT",
-            "Osaka": "KIX",
-            "Seoul": "ICN",
-            "Manila": "MNL",
-            "Ho Chi Minh City": "SGN",
-            "Hanoi": "HAN",
-            "Riyadh": "RUH",
-            "Jeddah": "JED",
-            "Kuwait City": "KWI",
-            "Manama": "BAH",
-            "Muscat": "MCT",
-            "Beirut": "BEY",
-            "Kabul": "KBL",
-            "Almaty": "ALA",
-            "Tashkent": "TAS",
-            "Bishkek": "FRU",
-            "Ashgabat": "ASB",
-            "Ulaanbaatar": "ULN",
-            "Kathmandu": "KTM",
-            
-            # Europe
-            "Frankfurt": "FRA",
-            "Munich": "MUC",
-            "Berlin": "BER",
-            "Paris": "CDG",
-            "Lyon": "LYS",
-            "Amsterdam": "AMS",
-            "Rome": "FCO",
-            "Milan": "MXP",
-            "Madrid": "MAD",
-            "Barcelona": "BCN",
-            "London": "LHR",
-            "Manchester": "MAN",
-            "Moscow": "SVO",
-            "Saint Petersburg": "LED",
-            "Vienna": "VIE",
-            "Brussels": "BRU",
-            "Zurich": "ZUR",
-            "Geneva": "GVA",
-            "Stockholm": "ARN",
-            "Oslo": "OSL",
-            "Copenhagen": "CPH",
-            "Helsinki": "HEL",
-            "Warsaw": "WAW",
-            "Krakow": "KRK",
-            "Prague": "PRG",
-            "Budapest": "BUD",
-            "Athens": "ATH",
-            "Lisbon": "LIS",
-            "Bucharest": "OTP",
-            "Sofia": "SOF",
-            "Zagreb": "ZAG",
-            "Belgrade": "BEG",
-            "Sarajevo": "SJJ",
-            "Podgorica": "TGD",
-            "Ljubljana": "LJU",
-            "Skopje": "SKP",
-            "Baku": "GYD",
-            "Tbilisi": "TBS",
-            "Chisinau": "KIV",
-            "Tallinn": "TLL",
-            "Riga": "RIX",
-            "Vilnius": "VNO",
-            "Luxembourg": "LUX",
-            "Valletta": "MLA",
-            "Dublin": "DUB",
-            
-            # Africa
-            "Cairo": "CAI",
-            "Alexandria": "HBE",
-            "Nairobi": "NBO",
-            "Johannesburg": "JNB",
-            "Cape Town": "CPT",
-            "Casablanca": "CMN",
-            "Marrakech": "RAK",
-            "Tunis": "TUN",
-            "Algiers": "ALG",
-            "Tripoli": "TIP",
-            "Addis Ababa": "ADD",
-            "Accra": "ACC",
-            "Lagos": "LOS",
-            "Abuja": "ABV",
-            "Dakar": "DKR",
-            "Abidjan": "ABJ",
-            "Douala": "DLA",
-            "Kinshasa": "FIH",
-            "Luanda": "LAD",
-            "Kampala": "EBB",
-            "Dar es Salaam": "DAR",
-            "Kigali": "KGL",
-            "Port Louis": "MRU",
-            "Antananarivo": "TNR",
-            
-            # North America
-            "New York": "JFK",
-            "Los Angeles": "LAX",
-            "Chicago": "ORD",
-            "Miami": "MIA",
-            "San Francisco": "SFO",
-            "Washington DC": "DCA",
-            "Seattle": "SEA",
-            "Boston": "BOS",
-            "Toronto": "YYZ",
-            "Montreal": "YUL",
-            "Vancouver": "YVR",
-            "Mexico City": "MEX",
-            "Cancun": "CUN",
-            "Havana": "HAV",
-            "Panama City": "PTY",
-            
-            # South America
-            "Sao Paulo": "GRU",
-            "Rio de Janeiro": "GIG",
-            "Buenos Aires": "EZE",
-            "Bogota": "BOG",
-            "Medellin": "MDE",
-            "Santiago": "SCL",
-            "Caracas": "CCS",
-            
-            # Oceania
-            "Melbourne": "MEL",
-            "Sydney": "SYD",
-            "Perth": "PER",
-        }
-        
-        return airport_mapping.get(city, city[:3].upper())
+        return AIRPORT_CODES.get((country_code, city)) or city[:3].upper()
     
     def route_to_signature(self, route):
         """Convert route to a unique signature for tracking completion"""
-        return tuple(sorted([(stop["city"], stop["country_code"], stop["continent"]) for stop in route]))
+        return _stops_signature((stop["city"], stop["country_code"], stop["continent"]) for stop in route)
     
     def load_existing_progress(self):
         """Load existing progress from JSON files"""
         completed_count = 0
         
-        # Load progress tracking file
+        # Progress files from older versions list every completed route inline
         if os.path.exists(self.progress_file):
             try:
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    progress_data = json.load(f)
-                    self.completed_routes = set(tuple(sig) for sig in progress_data.get('completed_routes', []))
-                    completed_count = len(self.completed_routes)
-                    print(f"📂 Loaded existing progress: {completed_count} routes already completed")
+                with open(self.progress_file, 'rb') as f:
+                    progress_data = orjson.loads(f.read())
+                for sig in progress_data.get('completed_routes', []):
+                    # ...some store each route as its sorted stop triples instead of an int
+                    self._add_completed(sig if isinstance(sig, int) else _stops_signature(sig))
+            except Exception as e:
+                logger.warning(f"⚠️  Error loading progress file: {e}")
+        
+        # Merge the per-shard signature files
+        for shard in range(_PROGRESS_SHARDS):
+            shard_file = self._shard_file(shard)
+            if not os.path.exists(shard_file):
+                continue
+            try:
+                with open(shard_file, 'rb') as f:
+                    self._sig_shards[shard].update(orjson.loads(f.read()))
             except Exception as e:
-                print(f"⚠️  Error loading progress file: {e}")
-                self.completed_routes = set()
+                logger.warning(f"⚠️  Error loading progress shard {shard_file}: {e}")
+        
+        if self.completed_route_count() > 0:
+            logger.info(f"📂 Loaded existing progress: {self.completed_route_count()} routes already completed")
         
-        # Load existing results file to get current results
-        if os.path.exists(self.results_file):
+        # Migrate a results file written by older versions into the append-only log
+        if not os.path.exists(self.results_log_file) and os.path.exists(self.results_file):
             try:
-                with open(self.results_file, 'r', encoding='utf-8') as f:
-                    existing_results = json.load(f)
-                    print(f"📂 Found existing results file with {len(existing_results)} results")
+                with open(self.results_file, 'rb') as f:
+                    existing_results = orjson.loads(f.read())
+                with open(self.results_log_file, 'wb') as f:
+                    f.write(b"".join(orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE) for result in existing_results))
+                logger.info(f"📂 Migrated {len(existing_results)} results from {self.results_file} to {self.results_log_file}")
             except Exception as e:
-                print(f"⚠️  Error loading results file: {e}")
+                logger.warning(f"⚠️  Error migrating results file: {e}")
+        
+        # Stream the results log into the in-memory sorted index. Every logged route counts as
+        # completed, even if the progress shards were not flushed before the last run stopped.
+        recovered = 0
+        try:
+            for result in self.iter_results_log():
+                self._index_result(result)
+                route = result.get('route')
+                if route:
+                    route_signature = self.route_to_signature(route)
+                    if route_signature not in self._sig_shards[route_signature & (_PROGRESS_SHARDS - 1)]:
+                        self._add_completed(route_signature)
+                        recovered += 1
+            if self._sorted_results:
+                logger.info(f"📂 Found existing results log with {len(self._sorted_results)} results")
+            if recovered:
+                logger.info(f"📂 Recovered {recovered} completed routes from the results log")
+        except Exception as e:
+            logger.warning(f"⚠️  Error loading results log: {e}")
         
+        completed_count = self.completed_route_count()
         if completed_count > 0:
-            print(f"🔄 Resume mode: Will skip {completed_count} already completed routes")
+            logger.info(f"🔄 Resume mode: Will skip {completed_count} already completed routes")
+    
+    def _shard_file(self, shard):
+        """Path of the progress file holding one shard of completed route signatures"""
+        return f"{os.path.splitext(self.progress_file)[0]}.shard{shard}.json"
+    
+    def _add_completed(self, route_signature):
+        """Record a completed route signature and mark its shard for the next flush"""
+        shard = route_signature & (_PROGRESS_SHARDS - 1)
+        self._sig_shards[shard].add(route_signature)
+        self._dirty_shards.add(shard)
+    
+    def completed_route_count(self):
+        """Number of routes already completed across all shards"""
+        return sum(len(shard) for shard in self._sig_shards)
     
     def save_progress(self, route_signature):
-        """Save progress after completing a route (thread-safe)"""
-        with self.file_lock:
-            try:
-                self.completed_routes.add(route_signature)
-                
-                # Save progress tracking
-                progress_data = {
-                    'completed_routes': list(self.completed_routes),
-                    'last_updated': datetime.now().isoformat(),
-                    'total_completed': len(self.completed_routes)
-                }
-                
-                with open(self.progress_file, 'w', encoding='utf-8') as f:
-                    json.dump(progress_data, f, indent=2, ensure_ascii=False)
-                
-            except Exception as e:
-                print(f"⚠️  Error saving progress: {e}")
+        """Queue a completed route signature for the writer thread"""
+        self._io_queue.put(("progress", route_signature))
+    
+    def _write_progress(self):
+        """Rewrite the dirty progress shards, then the small progress summary file"""
+        try:
+            for shard in sorted(self._dirty_shards):
+                _write_json_atomic(self._shard_file(shard), list(self._sig_shards[shard]))
+            self._dirty_shards.clear()
+            
+            # Written last: once it no longer lists routes inline, older data lives in the shards
+            progress_data = {
+                'shards': _PROGRESS_SHARDS,
+                'last_updated': datetime.now().isoformat(),
+                'total_completed': self.completed_route_count()
+            }
+            
+            _write_json_atomic(self.progress_file, progress_data)
+            
+        except Exception as e:
+            logger.error(f"❌ Error saving progress: {e}")
+    
+    def iter_results_log(self):
+        """Yield results one at a time from the append-only results log"""
+        if not os.path.exists(self.results_log_file):
+            return
+        with open(self.results_log_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield orjson.loads(line)
+                except ValueError:
+                    # A partially written last line from an interrupted run
+                    logger.warning(f"⚠️  Skipping corrupt line in {self.results_log_file}")
+    
+    def _open_results_log(self):
+        """Open the results log for appending, cutting off a partial last line left by a crash"""
+        fh = open(self.results_log_file, 'a+b')
+        size = fh.seek(0, os.SEEK_END)
+        if size:
+            fh.seek(size - 1)
+            if fh.read(1) != b"\n":
+                # Otherwise the next result would be glued onto the fragment and both lost
+                end = size
+                while end > 0:
+                    start = max(0, end - 65536)
+                    fh.seek(start)
+                    newline = fh.read(end - start).rfind(b"\n")
+                    if newline != -1:
+                        end = start + newline + 1
+                        break
+                    end = start
+                fh.truncate(end)
+                logger.warning(f"⚠️  Dropped a partial last line from {self.results_log_file}")
+        return fh
+    
+    def _index_result(self, result):
+        """Insert a result into the in-memory index ordered by total cost"""
+        bisect.insort(self._sorted_results, (result.get("total_cost_inr", 999999), next(self._result_seq), result))
+    
+    def sorted_results(self):
+        """Return all known results, cheapest first"""
+        return [result for _, _, result in self._sorted_results]
     
     def save_result_to_file(self, result):
-        """Save individual result to results file immediately (thread-safe)"""
-        with self.file_lock:
+        """Queue an individual result for the writer thread"""
+        self._io_queue.put(("result", result))
+    
+    def _write_results(self, results):
+        """Append a batch of results to the results log with a single write"""
+        try:
+            self._results_fh.write(b"".join(orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE) for result in results))
+            self._results_fh.flush()
+            for result in results:
+                self._index_result(result)
+        except Exception as e:
+            logger.error(f"❌ Error saving result: {e}")
+    
+    def _io_worker(self):
+        """Writer thread: owns all progress/results file writes.
+        
+        Results are appended as soon as they arrive. The progress file is only rewritten
+        once flush_threshold new routes have completed or flush_interval seconds have
+        passed. Completed routes are also recovered from the results log on startup, so
+        after a crash only up to flush_threshold discarded routes may be searched again.
+        """
+        while True:
             try:
-                # Load existing results
-                existing_results = []
-                if os.path.exists(self.results_file):
-                    try:
-                        with open(self.results_file, 'r', encoding='utf-8') as f:
-                            existing_results = json.load(f)
-                    except:
-                        existing_results = []
-                
-                # Add new result
-                existing_results.append(result)
-                
-                # Sort by cost and save
-                existing_results.sort(key=lambda x: x.get("total_cost_inr", 999999))
-                
-                with open(self.results_file, 'w', encoding='utf-8') as f:
-                    json.dump(existing_results, f, indent=2, ensure_ascii=False)
-                
-            except Exception as e:
-                print(f"⚠️  Error saving result: {e}")
+                # Wake up periodically so a few pending completions still get persisted
+                items = [self._io_queue.get(timeout=self._flush_interval)]
+            except queue.Empty:
+                items = []
+            # Drain everything already pending so a burst costs one write per file
+            while True:
+                try:
+                    items.append(self._io_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = False
+            force_flush = False
+            results = []
+            for kind, payload in items:
+                if kind is _IO_STOP:
+                    stop = force_flush = True
+                elif kind == "flush":
+                    force_flush = True
+                elif kind == "result":
+                    results.append(payload)
+                elif kind == "progress":
+                    self._add_completed(payload)
+                    self._dirty_since_flush += 1
+            
+            with self.file_lock:
+                if results:
+                    self._write_results(results)
+                if self._dirty_since_flush and (
+                    force_flush
+                    or self._dirty_since_flush >= self._flush_threshold
+                    or time.monotonic() - self._last_flush >= self._flush_interval
+                ):
+                    self._write_progress()
+                    self._dirty_since_flush = 0
+                    self._last_flush = time.monotonic()
+            
+            for _ in items:
+                self._io_queue.task_done()
+            if stop:
+                return
+    
+    def flush(self):
+        """Block until every queued write, including debounced progress, has reached disk"""
+        self._io_queue.put(("flush", None))
+        self._io_queue.join()
+    
+    def finalize_results(self):
+        """Write the sorted JSON snapshot of the results log (call once, at the end of a run)"""
+        self.flush()
+        with self.file_lock:
+            self._results_fh.flush()
+            all_results = sorted(self.iter_results_log(), key=lambda x: x.get("total_cost_inr", 999999))
+            _write_json_atomic(self.results_file, all_results)
+        return all_results
+    
+    def close(self):
+        """Stop the writer thread after it drains its queue and release open file handles"""
+        if self._io_thread.is_alive():
+            self._io_queue.put((_IO_STOP, None))
+            self._io_thread.join()
+        with self.file_lock:
+            if not self._results_fh.closed:
+                self._results_fh.close()
+        self.save_segment_cache()
+        self.save_leg_stats()
+    
+    def load_leg_stats(self):
+        """Load per-segment success rates learned by previous runs"""
+        if not os.path.exists(self.leg_stats_file):
+            return
+        try:
+            with open(self.leg_stats_file, 'rb') as f:
+                for origin, destination, rate in orjson.loads(f.read()):
+                    self._leg_success[(origin, destination)] = rate
+        except Exception as e:
+            logger.warning(f"⚠️  Error loading segment stats: {e}")
+    
+    def save_leg_stats(self):
+        """Persist per-segment success rates for the next run's search order"""
+        with self._segment_cache_lock:
+            entries = [[origin, destination, rate] for (origin, destination), rate in self._leg_success.items()]
+        try:
+            _write_json_atomic(self.leg_stats_file, entries)
+        except Exception as e:
+            logger.error(f"❌ Error saving segment stats: {e}")
+    
+    def _segment_fresh(self, fetched_at, flight_results, now):
+        """Whether a cached segment search is still valid (empty results expire sooner)"""
+        ttl = self.segment_cache_ttl if any(flight_results.values()) else self.segment_cache_negative_ttl
+        return now - fetched_at < ttl
+    
+    def load_segment_cache(self):
+        """Load segment searches saved by previous runs, dropping expired ones"""
+        if not os.path.exists(self.segment_cache_file):
+            return
+        try:
+            with open(self.segment_cache_file, 'rb') as f:
+                entries = orjson.loads(f.read())
+            now = time.time()
+            for entry in entries:
+                if len(entry) != 6:
+                    continue  # Saved before the airline was part of the key
+                origin, destination, date, airline, fetched_at, flight_results = entry
+                if self._segment_fresh(fetched_at, flight_results, now):
+                    # Saved as plain JSON objects; rebuild the Flight records the scraper returns
+                    flight_results = {
+                        category: [Flight.from_dict(flight) for flight in flights] if isinstance(flights, list) else flights
+                        for category, flights in flight_results.items()
+                    }
+                    self._segment_cache[(origin, destination, date, airline)] = (fetched_at, flight_results)
+            logger.info(f"📂 Loaded {len(self._segment_cache)} cached segment searches")
+        except Exception as e:
+            logger.warning(f"⚠️  Error loading segment cache: {e}")
+    
+    def save_segment_cache(self):
+        """Persist unexpired segment searches so the next run can reuse them"""
+        now = time.time()
+        with self._segment_cache_lock:
+            entries = [
+                [origin, destination, date, airline, fetched_at, flight_results]
+                for (origin, destination, date, airline), (fetched_at, flight_results) in self._segment_cache.items()
+                if self._segment_fresh(fetched_at, flight_results, now)
+            ]
+        try:
+            _write_json_atomic(self.segment_cache_file, entries)
+        except Exception as e:
+            logger.error(f"❌ Error saving segment cache: {e}")
+    
+    def _lookup_segment(self, key, now):
+        """Return the search for key from this run or a fresh cache entry, or None (caller holds _segment_cache_lock)"""
+        flight_results = self._leg_table.get(key)
+        if flight_results is not None:
+            return flight_results
+        entry = self._segment_cache.get(key)
+        if entry is not None and self._segment_fresh(entry[0], entry[1], now):
+            # Pin it so it does not expire while later routes still need it
+            self._pin_leg(key, entry[1], self._segment_usable(entry[1]))
+            return entry[1]
+        return None
+    
+    def _pin_leg(self, key, flight_results, usable):
+        """Keep a segment search for the rest of the run (caller holds _segment_cache_lock)"""
+        self._leg_table[key] = flight_results
+        if not usable:
+            self._dead_legs.add(key)
+    
+    def cached_search(self, scraper, origin_code, dest_code, departure_date):
+        """Search one segment, reusing a previous search of the same segment when possible.
+        
+        Concurrent requests for the same segment wait for the first one instead of
+        searching again. Only real searches go through the rate limiter. A failed scrape
+        is retried _SCRAPE_RETRIES times; if it still fails, None is returned, for this
+        and every later request of the segment in this run. Every answer,
+        empty ones included, is kept in the leg table for the rest of the run. Only real
+        answers from Google are cached on disk, where "no flights" only stays valid for
+        segment_cache_negative_ttl seconds; failed scrapes are never cached.
+        """
+        key = (origin_code, dest_code, departure_date, scraper.airline_filter)
+        while True:
+            with self._segment_cache_lock:
+                flight_results = self._lookup_segment(key, time.time())
+                if flight_results is not None or key in self._failed_legs:
+                    return flight_results
+                event = self._segment_inflight.get(key)
+                if event is None:
+                    event = self._segment_inflight[key] = threading.Event()
+                    break
+            # Another thread is searching this segment; re-check the cache once it is done
+            event.wait()
+        
+        try:
+            flight_results = None
+            for attempt in range(1, _SCRAPE_RETRIES + 2):
+                # Wait for the shared rate limiter before hitting Google Flights
+                if self._rate_limiter is not None:
+                    self._rate_limiter.acquire()
+                try:
+                    flight_results = scraper.search(origin_code, dest_code, departure_date, passengers=1)
+                except Exception as e:
+                    logger.error(f"❌ Error searching {origin_code} → {dest_code}: {e}")
+                if flight_results is not None:
+                    break
+                logger.warning(f"⚠️  Search failed for {origin_code} → {dest_code} (attempt {attempt}/{_SCRAPE_RETRIES + 1})")
+            if flight_results is None:
+                # Still failing: not an answer, so it is neither cached nor counted against the
+                # segment, and routes through it are left for the next run
+                with self._segment_cache_lock:
+                    self._failed_legs.add(key)
+                return None
+            usable = self._segment_usable(flight_results)
+            self._record_leg((origin_code, dest_code), usable)
+            with self._segment_cache_lock:
+                self._segment_cache[key] = (time.time(), flight_results)
+                self._pin_leg(key, flight_results, usable)
+            return flight_results
+        finally:
+            with self._segment_cache_lock:
+                del self._segment_inflight[key]
+            event.set()
     
     def is_route_completed(self, route):
         """Check if a route has already been completed"""
         route_signature = self.route_to_signature(route)
-        return route_signature in self.completed_routes
+        return route_signature in self._sig_shards[route_signature & (_PROGRESS_SHARDS - 1)]
     
     def create_scraper(self, headless=True):
         """Create a new GoogleFlights instance for thread-local use"""
-        return GoogleFlights(headless=headless, airline_filter="Turkish Airlines", formatted_date=self.departure_date_google)
+        return GoogleFlights(headless=headless, airline_filter=_AIRLINE_FILTER, formatted_date=self.departure_date_google)
     
     def update_progress(self, success=True, discarded=False):
         """Thread-safe progress tracking with early termination stats"""
@@ -330,105 +654,217 @@ class TurkishAirlinesOptimizer:
             if success:
                 self.completed_count += 1
             elif discarded:
-                if not hasattr(self, 'discarded_count'):
-                    self.discarded_count = 0
                 self.discarded_count += 1
             else:
                 self.failed_count += 1
             
-            total_processed = self.completed_count + getattr(self, 'discarded_count', 0) + self.failed_count
+            total_processed = self.completed_count + self.discarded_count + self.failed_count
             if total_processed % 10 == 0 or total_processed <= 20:  # Log every 10 routes or first 20
-                discarded_info = f", {getattr(self, 'discarded_count', 0)} discarded" if hasattr(self, 'discarded_count') else ""
-                print(f"📊 Progress: {self.completed_count} completed, {self.failed_count} failed{discarded_info}, {total_processed}/{self.max_routes_to_search} total")
+                discarded_info = f", {self.discarded_count} discarded" if self.discarded_count else ""
+                logger.info(f"📊 Progress: {self.completed_count} completed, {self.failed_count} failed{discarded_info}, {total_processed}/{self.max_routes_to_search} total")
+    
+    def route_airport_codes(self, route):
+        """Airport code of every stop of a route, in order"""
+        return [self.city_to_airport_code(stop['city'], stop['country_code']) for stop in route]
+    
+    def _prefetch_phase(self, pending_routes, departure_date=None):
+        """Worker-pool phase searching every distinct segment of the pending routes once.
+        
+        Returns (segments, handle, on_done) for _run_worker_pool, to run before the route phase.
+        Routes share most of their segments, so this costs one search per unique
+        segment (plus retries of failed scrapes); the route phase then assembles routes
+        from the in-memory leg table.
+        Segments are searched rarest first, and once a segment turns out to have no
+        valid flight every route through it is dropped, along with any segment that
+        no remaining route needs. The route phase discards dropped routes without
+        searching them (see _dead_legs).
+        """
+        if departure_date is None:
+            departure_date = self.departure_date_short
+        
+        # Unique segments in first-seen route order, and the routes each one belongs to
+        total_segments = 0
+        route_legs = []
+        segment_routes = {}
+        for route, _ in pending_routes:
+            codes = self.route_airport_codes(route)
+            legs = list(zip(codes, codes[1:]))
+            total_segments += len(legs)
+            for leg in legs:
+                segment_routes.setdefault(leg, []).append(len(route_legs))
+            route_legs.append(legs)
+        live_routes = [True] * len(route_legs)
+        live_count = {leg: len(route_ids) for leg, route_ids in segment_routes.items()}
+        prune_lock = threading.Lock()
+        
+        def drop_routes_through(leg):
+            """Mark every route through a dead segment as dropped (caller holds prune_lock)"""
+            for route_id in segment_routes[leg]:
+                if live_routes[route_id]:
+                    live_routes[route_id] = False
+                    for other in route_legs[route_id]:
+                        live_count[other] -= 1
+        
+        now = time.time()
+        with self._segment_cache_lock:
+            cached = {
+                leg: self._lookup_segment((*leg, departure_date, _AIRLINE_FILTER), now)
+                for leg in segment_routes
+            }
+        todo = []
+        with prune_lock:
+            for leg, flight_results in cached.items():
+                if flight_results is None:
+                    todo.append(leg)
+                elif (*leg, departure_date, _AIRLINE_FILTER) in self._dead_legs:
+                    drop_routes_through(leg)
+        todo = [leg for leg in todo if live_count[leg]]
+        # Rarest segments first so dead ones prune as many searches as possible
+        todo.sort(key=self.leg_success_rate)
+        logger.info(f"🧩 {len(segment_routes)} unique segments across {total_segments} route segments ({len(cached) - sum(1 for v in cached.values() if v is None)} already cached, {len(todo)} to search)")
+        
+        pruned = []
+        
+        def handle_segment(leg, scraper):
+            with prune_lock:
+                if not live_count[leg]:
+                    pruned.append(leg)  # Every route through it already died elsewhere
+                    return
+            origin_code, dest_code = leg
+            try:
+                flight_results = self.cached_search(scraper, origin_code, dest_code, departure_date)
+                # Routes through a failed segment fail without searching, so prune it like a dead one
+                usable = flight_results is not None and (origin_code, dest_code, departure_date, _AIRLINE_FILTER) not in self._dead_legs
+            except Exception as e:
+                logger.warning(f"⚠️  Error prefetching {origin_code} → {dest_code}: {e}")
+                usable = False
+            if not usable:
+                with prune_lock:
+                    drop_routes_through(leg)
+        
+        start_time = time.time()
+        
+        def report():
+            logger.info(f"⏱️  Segment prefetch time: {time.time() - start_time:.2f} seconds ({len(pruned)} searches skipped, {live_routes.count(False)} routes already dead)")
+        
+        return todo, handle_segment, report
+    
+    def _segment_usable(self, flight_results):
+        """Whether a segment search has a valid Turkish Airlines flight"""
+        all_flights = _segment_flights(flight_results)
+        return bool(all_flights) and self.cheapest_valid_turkish(all_flights, threading.current_thread().name)[0] is not None
+    
+    def leg_success_rate(self, leg):
+        """Smoothed share of searches of (origin_code, dest_code) that had a valid flight"""
+        return self._leg_success.get(leg, _UNKNOWN_LEG_RATE)
+    
+    def _record_leg(self, leg, usable):
+        """Fold one search outcome into the segment's success rate"""
+        with self._segment_cache_lock:
+            rate = self._leg_success.get(leg, _UNKNOWN_LEG_RATE)
+            self._leg_success[leg] = rate + _LEG_RATE_ALPHA * ((1.0 if usable else 0.0) - rate)
+    
+    def _probe_order(self, codes, departure_date):
+        """Segment indices of a route, cached ones first, then least likely to have a valid flight"""
+        now = time.time()
+        with self._segment_cache_lock:
+            uncached = [
+                self._lookup_segment((origin_code, dest_code, departure_date, _AIRLINE_FILTER), now) is None
+                for origin_code, dest_code in zip(codes, codes[1:])
+            ]
+        return sorted(range(len(uncached)), key=lambda i: (uncached[i], self.leg_success_rate((codes[i], codes[i + 1]))))
     
     def search_route_flights(self, route, scraper, route_index, departure_date=None):
-        """Search for flights for each segment of a route (thread-safe version with early termination)"""
+        """Search for flights for each segment of a route (thread-safe version with early termination)
+        
+        Returns the result, None for a discarded route, or _ROUTE_FAILED when a segment
+        search kept failing (the route is then not saved as completed).
+        """
         # Use the instance departure date if no specific date is provided
         if departure_date is None:
             departure_date = self.departure_date_short
         
-        route_flights = []
-        total_cost = 0
+        route_signature = self.route_to_signature(route)
         
         thread_id = threading.current_thread().name
-        print(f"\n🔍 [{thread_id}] Route #{route_index}: Searching flights for route:")
+        logger.info(f"\n🔍 [{thread_id}] Route #{route_index}: Searching flights for route:")
         for i, stop in enumerate(route):
-            print(f"  {i+1}. {stop['city']}, {stop['country_code']} ({stop['continent']})")
+            logger.info(f"  {i+1}. {stop['city']}, {stop['country_code']} ({stop['continent']})")
+        
+        # Resolve every stop's airport code once, and bind hot-loop callables to locals
+        cities = [stop['city'] for stop in route]
+        codes = self.route_airport_codes(route)
+        search = self.cached_search
+        cheapest_valid = self.cheapest_valid_turkish
+        num_segments = len(route) - 1
+        
+        segment_results = [None] * num_segments
+        
+        # Skip routes through a segment this run already found dead (e.g. during the prefetch)
+        for i in range(num_segments):
+            key = (codes[i], codes[i + 1], departure_date, _AIRLINE_FILTER)
+            if key in self._dead_legs:
+                logger.info(f"    [{thread_id}] 🚫 Route discarded: {cities[i]} ({codes[i]}) → {cities[i + 1]} ({codes[i + 1]}) has no valid Turkish Airlines flight")
+                self.save_progress(route_signature)
+                return None
+            if key in self._failed_legs:
+                logger.warning(f"    [{thread_id}] ⚠️  Route failed: search of {cities[i]} ({codes[i]}) → {cities[i + 1]} ({codes[i + 1]}) kept failing, retrying next run")
+                return _ROUTE_FAILED
         
         try:
-            # Search for flights between consecutive cities
-            for i in range(len(route) - 1):
-                origin_city = route[i]['city']
-                origin_code = self.city_to_airport_code(origin_city, route[i]['country_code'])
-                
-                dest_city = route[i + 1]['city']
-                dest_code = self.city_to_airport_code(dest_city, route[i + 1]['country_code'])
-                
-                print(f"  [{thread_id}] 🛫 Searching: {origin_city} ({origin_code}) → {dest_city} ({dest_code})")
+            # Probe the segments most likely to kill the route first; results keep route order
+            for i in self._probe_order(codes, departure_date):
+                origin_city, dest_city = cities[i], cities[i + 1]
+                origin_code, dest_code = codes[i], codes[i + 1]
+                logger.info(f"  [{thread_id}] 🛫 Searching: {origin_city} ({origin_code}) → {dest_city} ({dest_code})")
                 
                 try:
-                    # Search for flights
-                    flight_results = scraper.search(
-                        origin_code, dest_code, departure_date, passengers=1
-                    )
+                    # Search for flights (shared with every other route that has this segment)
+                    flight_results = search(scraper, origin_code, dest_code, departure_date)
+                    if flight_results is None:
+                        # The scrape kept failing; not saved as completed, so the next run retries it
+                        logger.warning(f"    [{thread_id}] ⚠️  Route failed: search of {origin_city} → {dest_city} kept failing, retrying next run")
+                        return _ROUTE_FAILED
                     
                     # Get cheapest flight from all available categories
-                    all_flights = []
-                    
-                    # Check both top_flights and all_flights keys
-                    for key in ["top_flights", "all_flights"]:
-                        flights = flight_results.get(key, [])
-                        if flights:
-                            all_flights.extend(flights)
-                    
-                    # If no flights in common keys, check all keys in the response
-                    if not all_flights:
-                        for key, value in flight_results.items():
-                            if isinstance(value, list) and value:
-                                all_flights.extend(value)
+                    all_flights = _segment_flights(flight_results)
                     
                     if all_flights:
-                        # Filter flights to only include Turkish Airlines operated flights with IST route
-                        valid_flights = self.filter_turkish_airlines_flights(all_flights, thread_id)
+                        # Pick the cheapest Turkish Airlines operated flight with IST route
+                        cheapest, price, valid_count = cheapest_valid(all_flights, thread_id)
                         
-                        if valid_flights:
-                            cheapest = min(valid_flights, key=lambda x: self.parse_price(x.get("price", "₹999,999")))
-                            route_flights.append({
+                        if cheapest is not None:
+                            segment_results[i] = ({
                                 "segment": f"{origin_city} → {dest_city}",
                                 "origin": origin_code,
                                 "destination": dest_code,
                                 "flight": cheapest
-                            })
+                            }, price)
                             
-                            price = self.parse_price(cheapest.get("price", "₹0"))
-                            total_cost += price
-                            print(f"    [{thread_id}] ✅ Found {len(valid_flights)} valid Turkish Airlines flights, cheapest: {cheapest.get('price', 'N/A')}")
+                            logger.info(f"    [{thread_id}] ✅ Found {valid_count} valid Turkish Airlines flights, cheapest: {cheapest.get('price', 'N/A')}")
                         else:
-                            print(f"    [{thread_id}] ❌ No valid Turkish Airlines flights found for segment {i+1}/{len(route)-1}")
-                            print(f"    [{thread_id}] 🚫 EARLY TERMINATION: Route discarded due to missing Turkish Airlines flight")
+                            logger.info(f"    [{thread_id}] ❌ No valid Turkish Airlines flights found for segment {i+1}/{num_segments}")
+                            logger.info(f"    [{thread_id}] 🚫 EARLY TERMINATION: Route discarded due to missing Turkish Airlines flight")
                             # Mark route as processed but invalid - save to avoid re-processing
-                            route_signature = self.route_to_signature(route)
                             self.save_progress(route_signature)
                             return None  # Early termination - route is useless
                     else:
-                        print(f"    [{thread_id}] ❌ No flights found for segment {i+1}/{len(route)-1}")
-                        print(f"    [{thread_id}] 🚫 EARLY TERMINATION: Route discarded due to no flights available")
+                        logger.info(f"    [{thread_id}] ❌ No flights found for segment {i+1}/{num_segments}")
+                        logger.info(f"    [{thread_id}] 🚫 EARLY TERMINATION: Route discarded due to no flights available")
                         # Mark route as processed but invalid - save to avoid re-processing
-                        route_signature = self.route_to_signature(route)
                         self.save_progress(route_signature)
                         return None  # Early termination - route is useless
                     
-                    # Rate limiting per thread
-                    time.sleep(self.rate_limit_delay)
-                    
                 except Exception as e:
-                    print(f"    [{thread_id}] ❌ Error searching {origin_city} → {dest_city}: {e}")
-                    print(f"    [{thread_id}] 🚫 EARLY TERMINATION: Route discarded due to search error")
+                    logger.info(f"    [{thread_id}] ❌ Error searching {origin_city} → {dest_city}: {e}")
+                    logger.info(f"    [{thread_id}] 🚫 EARLY TERMINATION: Route discarded due to search error")
                     # Mark route as processed but invalid - save to avoid re-processing
-                    route_signature = self.route_to_signature(route)
                     self.save_progress(route_signature)
                     return None  # Early termination - route has errors
             
+            route_flights = [flight for flight, _ in segment_results]
+            total_cost = sum(price if price != _PRICE_UNKNOWN else _PRICE_FALLBACK for _, price in segment_results)
+            
             # If we reach here, all segments have valid Turkish Airlines flights
             result = {
                 "route_index": route_index,
@@ -441,60 +877,102 @@ class TurkishAirlinesOptimizer:
                 "status": "complete_with_all_turkish_flights"
             }
             
-            print(f"    [{thread_id}] 🎉 ROUTE COMPLETE: All {len(route_flights)} segments have Turkish Airlines flights!")
+            logger.info(f"    [{thread_id}] 🎉 ROUTE COMPLETE: All {len(route_flights)} segments have Turkish Airlines flights!")
             
             # Save result immediately and mark as completed
             self.save_result_to_file(result)
-            route_signature = self.route_to_signature(route)
             self.save_progress(route_signature)
             
             self.update_progress(success=True)
             return result
             
         except Exception as e:
-            print(f"[{thread_id}] ❌ Failed to process route #{route_index}: {e}")
+            logger.info(f"[{thread_id}] ❌ Failed to process route #{route_index}: {e}")
             # Mark route as processed but failed - save to avoid re-processing
-            route_signature = self.route_to_signature(route)
             self.save_progress(route_signature)
             self.update_progress(success=False)
             return None
     
     def parse_price(self, price_str):
-        """Parse INR price string to float"""
-        if not price_str or price_str == "N/A":
-            return 999999
+        """Parse INR price string to int rupees (sys.maxsize when unknown)"""
+        return _parse_price(price_str)
+    
+    def _run_worker_pool(self, phases):
+        """Run each phase's handle(item, scraper) over its items on up to max_workers threads.
         
-        # Remove ₹ symbol and commas, convert to float
-        try:
-            cleaned = price_str.replace("₹", "").replace(",", "").strip()
-            return float(cleaned)
-        except:
-            return 999999
+        phases is a list of (items, handle, on_done). Each thread creates one scraper and
+        reuses it for every item of every phase, then closes it itself - Playwright objects
+        may only be used (and closed) by the thread that created them. A phase starts once
+        all threads are done with the previous one; on_done (if set) runs once in between.
+        """
+        num_workers = min(self.max_workers, max((len(items) for items, _, _ in phases), default=0))
+        if num_workers == 0:
+            return
+        stages = []
+        for items, handle, on_done in phases:
+            work_queue = queue.SimpleQueue()
+            for item in items:
+                work_queue.put(item)
+            stages.append((work_queue, handle, threading.Barrier(num_workers, action=on_done)))
+        
+        def worker():
+            scraper = self.create_scraper(headless=True)
+            try:
+                for work_queue, handle, phase_done in stages:
+                    while True:
+                        try:
+                            item = work_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        handle(item, scraper)
+                    phase_done.wait()
+            except BaseException:
+                # Release the other threads instead of leaving them waiting for this one
+                for _, _, phase_done in stages:
+                    phase_done.abort()
+                raise
+            finally:
+                # Clean up scraper resources
+                try:
+                    scraper.close()
+                except:
+                    pass
+        
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            workers = [executor.submit(worker) for _ in range(num_workers)]
+            for future in workers:
+                future.result()
     
-    def worker_search_route(self, args):
+    def worker_search_route(self, args, scraper):
         """Worker function for thread pool - searches a single route with early termination"""
         route, route_index = args
         
-        # Create a scraper instance for this thread
-        scraper = self.create_scraper(headless=True)
-        
+        result = self.search_route_flights(route, scraper, route_index)
+        if result is _ROUTE_FAILED:
+            self.update_progress(success=False)
+            return None
+        if result is None:
+            # Route was discarded due to early termination
+            self.update_progress(success=False, discarded=True)
+        return result
+    
+    def _handle_route(self, args, scraper):
+        """Search one pending route and report progress; never raises"""
+        route, route_index = args
         try:
-            result = self.search_route_flights(route, scraper, route_index)
-            if result is None:
-                # Route was discarded due to early termination
-                self.update_progress(success=False, discarded=True)
-            return result
-        finally:
-            # Clean up scraper resources
-            try:
-                scraper.close()
-            except:
-                pass
+            result = self.worker_search_route(args, scraper)
+            if result:
+                # Progress update (result already saved in search_route_flights)
+                with self.progress_lock:
+                    total_processed = self.completed_count + self.failed_count
+                    if total_processed % 5 == 0:  # More frequent updates
+                        logger.info(f"📊 Progress: {self.completed_count} completed, {self.failed_count} failed, {total_processed}/{self._pending_count} pending")
+        except Exception as e:
+            logger.info(f"❌ Route #{route_index} failed with exception: {e}")
+            self.update_progress(success=False)
     
     def search_all_routes_parallel(self, routes):
         """Search flights for all routes using multi-threading with resume capability"""
-        results = []
-        
         # Filter out already completed routes
         pending_routes = []
         skipped_count = 0
@@ -505,71 +983,45 @@ class TurkishAirlinesOptimizer:
             else:
                 skipped_count += 1
         
-        print(f"\n🌍 Starting MULTI-THREADED flight search with RESUME and EARLY TERMINATION...")
-        print(f"📊 Total routes: {self.max_routes_to_search}")
-        print(f"✅ Already completed: {skipped_count}")
-        print(f"🔄 Pending routes: {len(pending_routes)}")
-        print(f"🚫 Early termination: Routes with missing Turkish Airlines flights will be discarded")
-        print(f"🔧 Configuration: {self.max_workers} threads, {self.rate_limit_delay}s delay per thread")
-        print("="*90)
+        logger.info(f"\n🌍 Starting MULTI-THREADED flight search with RESUME and EARLY TERMINATION...")
+        logger.info(f"📊 Total routes: {self.max_routes_to_search}")
+        logger.info(f"✅ Already completed: {skipped_count}")
+        logger.info(f"🔄 Pending routes: {len(pending_routes)}")
+        logger.info(f"🚫 Early termination: Routes with missing Turkish Airlines flights will be discarded")
+        rate_info = f"{self._rate_limiter.rate:.1f} requests/s shared rate limit" if self._rate_limiter else "no rate limit"
+        logger.info(f"🔧 Configuration: {self.max_workers} threads, {rate_info}")
+        logger.info("="*90)
         
         if not pending_routes:
-            print("🎉 All routes already completed! Loading existing results...")
-            # Load and return existing results
-            if os.path.exists(self.results_file):
-                with open(self.results_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+            logger.info("🎉 All routes already completed! Loading existing results...")
+            self.finalize_results()
+            return self.sorted_results()
         
         start_time = time.time()
         
-        # Use ThreadPoolExecutor for parallel processing
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all pending tasks
-            future_to_route = {
-                executor.submit(self.worker_search_route, args): args 
-                for args in pending_routes
-            }
-            
-            # Process completed tasks as they finish
-            for future in as_completed(future_to_route):
-                route_args = future_to_route[future]
-                route, route_index = route_args
-                
-                try:
-                    result = future.result()
-                    if result:
-                        with self.results_lock:
-                            results.append(result)
-                        
-                        # Progress update (result already saved in search_route_flights)
-                        with self.progress_lock:
-                            total_processed = self.completed_count + self.failed_count
-                            if total_processed % 5 == 0:  # More frequent updates
-                                print(f"📊 Progress: {self.completed_count} completed, {self.failed_count} failed, {total_processed}/{len(pending_routes)} pending")
-                            
-                except Exception as e:
-                    print(f"❌ Route #{route_index} failed with exception: {e}")
-                    self.update_progress(success=False)
+        # Search each distinct segment once, then assemble routes from the leg table.
+        # Both phases share the worker threads, so each thread starts one browser for the run.
+        self._pending_count = len(pending_routes)
+        self._run_worker_pool([
+            self._prefetch_phase(pending_routes),
+            (pending_routes, self._handle_route, None),
+        ])
         
         elapsed_time = time.time() - start_time
         
-        print(f"\n⏱️  Processing time for new routes: {elapsed_time:.2f} seconds")
-        discarded_count = getattr(self, 'discarded_count', 0)
-        print(f"📊 Final stats: {self.completed_count} completed, {self.failed_count} failed, {discarded_count} discarded")
+        logger.info(f"\n⏱️  Processing time for new routes: {elapsed_time:.2f} seconds")
+        discarded_count = self.discarded_count
+        logger.info(f"📊 Final stats: {self.completed_count} completed, {self.failed_count} failed, {discarded_count} discarded")
         
         if discarded_count > 0:
-            print(f"🚀 Performance gain: Saved ~{discarded_count * 3 * self.rate_limit_delay:.1f} seconds by early termination")
-        
-        # Load complete results from file (includes both old and new)
-        if os.path.exists(self.results_file):
-            with open(self.results_file, 'r', encoding='utf-8') as f:
-                all_results = json.load(f)
-                complete_routes = [r for r in all_results if r.get('status') == 'complete_with_all_turkish_flights']
-                print(f"📂 Total results in file: {len(all_results)} (complete with Turkish flights: {len(complete_routes)})")
-                return all_results
+            logger.info(f"🚀 Performance gain: Saved ~{discarded_count * 3 * self.rate_limit_delay:.1f} seconds by early termination")
         
-        return results
+        # Materialize the sorted snapshot once; the in-memory index holds both old and new results
+        self.finalize_results()
+        all_results = self.sorted_results()
+        complete_routes = [r for r in all_results if r.get('status') == 'complete_with_all_turkish_flights']
+        logger.info(f"📂 Total results in file: {len(all_results)} (complete with Turkish flights: {len(complete_routes)})")
+        return all_results
     
     def search_all_routes(self, routes):
         """Search flights for all generated routes (now uses parallel processing)"""
@@ -577,29 +1029,29 @@ class TurkishAirlinesOptimizer:
     
     def save_results(self, results, filename="turkish_airlines_comprehensive_search.json"):
         """Save search results to JSON file"""
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        print(f"\n💾 Results saved to {filename}")
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        logger.info(f"\n💾 Results saved to {filename}")
     
     def print_summary(self, results):
         """Print summary of search results (focusing on complete Turkish Airlines routes)"""
-        print(f"\n🏆 SEARCH RESULTS SUMMARY")
-        print("="*80)
+        logger.info(f"\n🏆 SEARCH RESULTS SUMMARY")
+        logger.info("="*80)
         
         if not results:
-            print("No results found.")
+            logger.info("No results found.")
             return
         
         # Filter routes with complete Turkish Airlines coverage
         complete_routes = [r for r in results if r.get('status') == 'complete_with_all_turkish_flights']
         partial_routes = [r for r in results if r.get('status') != 'complete_with_all_turkish_flights']
         
-        print(f"✅ Complete Turkish Airlines routes: {len(complete_routes)}")
-        print(f"⚠️  Discarded/incomplete routes: {len(partial_routes)}")
-        print(f"📊 Total processed: {len(results)}")
+        logger.info(f"✅ Complete Turkish Airlines routes: {len(complete_routes)}")
+        logger.info(f"⚠️  Discarded/incomplete routes: {len(partial_routes)}")
+        logger.info(f"📊 Total processed: {len(results)}")
         
         if complete_routes:
-            print(f"\n🥇 TOP 5 CHEAPEST COMPLETE TURKISH AIRLINES ROUTES:")
+            logger.info(f"\n🥇 TOP 5 CHEAPEST COMPLETE TURKISH AIRLINES ROUTES:")
             
             # Sort complete routes by cost
             complete_routes.sort(key=lambda x: x.get("total_cost_inr", 999999))
@@ -608,85 +1060,84 @@ class TurkishAirlinesOptimizer:
                 route = result["route"]
                 easy_visa_count = sum(1 for stop in route if stop["easy_visa"])
                 
-                print(f"\n{i}. TOTAL COST: {result['total_cost_formatted']} | Easy Visa: {easy_visa_count}/6")
-                print("   Route:", " → ".join([f"{stop['city']} ({stop['country_code']})" for stop in route]))
-                print("   Flight segments (all Turkish Airlines):")
+                logger.info(f"\n{i}. TOTAL COST: {result['total_cost_formatted']} | Easy Visa: {easy_visa_count}/6")
+                logger.info("   Route: " + " → ".join([f"{stop['city']} ({stop['country_code']})" for stop in route]))
+                logger.info("   Flight segments (all Turkish Airlines):")
                 for flight_info in result["flights"]:
                     if flight_info["flight"]:
                         flight = flight_info["flight"]
                         route_info = " → ".join(flight.get("route", []))
-                        print(f"     • {flight_info['segment']}: {flight.get('price', 'N/A')} - {flight.get('duration', 'N/A')} (via {route_info})")
+                        logger.info(f"     • {flight_info['segment']}: {flight.get('price', 'N/A')} - {flight.get('duration', 'N/A')} (via {route_info})")
         else:
-            print(f"\n❌ No complete Turkish Airlines routes found yet.")
-            print(f"💡 Routes are discarded when any segment lacks Turkish Airlines flights.")
-            print(f"🔄 Continue processing more routes to find complete ones.")
+            logger.info(f"\n❌ No complete Turkish Airlines routes found yet.")
+            logger.info(f"💡 Routes are discarded when any segment lacks Turkish Airlines flights.")
+            logger.info(f"🔄 Continue processing more routes to find complete ones.")
         
         # Show efficiency statistics
-        if hasattr(self, 'discarded_count') and self.discarded_count > 0:
+        if self.discarded_count > 0:
             total_processed = len(results) + self.discarded_count
             efficiency = (len(complete_routes) / total_processed) * 100 if total_processed > 0 else 0
-            print(f"\n📈 Processing Efficiency:")
-            print(f"   • Routes with complete Turkish coverage: {efficiency:.1f}%")
-            print(f"   • Early termination saved time on {self.discarded_count} invalid routes")
+            logger.info(f"\n📈 Processing Efficiency:")
+            logger.info(f"   • Routes with complete Turkish coverage: {efficiency:.1f}%")
+            logger.info(f"   • Early termination saved time on {self.discarded_count} invalid routes")
 
+    def is_valid_turkish_flight(self, flight, thread_id="Main"):
+        """Check that a flight is operated by Turkish Airlines alone and routes via IST"""
+        # Check if airline is only Turkish Airlines (not codeshare)
+        airline = flight.get("airline", "")
+        if not airline:
+            logger.debug("      [%s] 🚫 Skipping flight with no airline info", thread_id)
+            return False
+        
+        # Skip flights that have multiple airlines (codeshare)
+        if airline.translate(_CODESHARE_SEP_TABLE) != airline:
+            logger.debug("      [%s] 🚫 Skipping codeshare flight: %s", thread_id, airline)
+            return False
+        
+        # Check if it's Turkish Airlines (handle various name formats)
+        airline_lower = airline.lower().strip()
+        is_turkish = any(name in airline_lower for name in _TURKISH_AIRLINES_NAMES)
+        if not is_turkish:
+            logger.debug("      [%s] 🚫 Skipping non-Turkish Airlines flight: %s", thread_id, airline)
+            return False
+        
+        # Check if route includes IST (Istanbul)
+        route = flight.get("route", [])
+        stops = flight.get("stops", [])
+        has_ist = _has_ist(flight)
+        
+        if not has_ist:
+            logger.debug("      [%s] 🚫 Skipping flight not via IST: route %s, stops %s", thread_id, route, stops)
+            return False
+        
+        logger.debug("      [%s] ✅ Valid Turkish Airlines flight via IST: route %s", thread_id, route)
+        return True
+    
     def filter_turkish_airlines_flights(self, flights, thread_id="Main"):
         """Filter flights to only include Turkish Airlines operated flights that route via IST"""
-        valid_flights = []
+        return [flight for flight in flights if self.is_valid_turkish_flight(flight, thread_id)]
+    
+    def cheapest_valid_turkish(self, flights, thread_id="Main"):
+        """Find the cheapest valid Turkish Airlines flight in a single pass.
+        
+        Returns (cheapest_flight, price, valid_count); cheapest_flight is None when no
+        flight passes the Turkish Airlines/IST checks.
+        """
+        is_valid = self.is_valid_turkish_flight
+        parse_price = self.parse_price
+        cheapest = None
+        cheapest_price = None
+        valid_count = 0
         
         for flight in flights:
-            # Check if airline is only Turkish Airlines (not codeshare)
-            airline = flight.get("airline", "")
-            if not airline:
-                print(f"      [{thread_id}] 🚫 Skipping flight with no airline info")
-                continue
-            
-            # Skip flights that have multiple airlines (codeshare)
-            if "," in airline or " + " in airline or "/" in airline:
-                print(f"      [{thread_id}] 🚫 Skipping codeshare flight: {airline}")
-                continue
-            
-            # Check if it's Turkish Airlines (handle various name formats)
-            airline_lower = airline.lower().strip()
-            turkish_airlines_names = [
-                "turkish airlines",
-                "turkish",
-                "thy",
-                "tk"  # IATA code
-            ]
-            
-            is_turkish = any(name in airline_lower for name in turkish_airlines_names)
-            if not is_turkish:
-                print(f"      [{thread_id}] 🚫 Skipping non-Turkish Airlines flight: {airline}")
-                continue
-            
-            # Check if route includes IST (Istanbul) - check both route and stops
-            route = flight.get("route", [])
-            stops = flight.get("stops", [])
-            
-            # Combine route and stops for comprehensive IST check
-            all_airports = []
-            if isinstance(route, list):
-                all_airports.extend(route)
-            if isinstance(stops, list):
-                all_airports.extend(stops)
-            
-            # Also check if IST is mentioned in any other fields
-            flight_str = str(flight).upper()
-            
-            has_ist = (
-                "IST" in all_airports or 
-                "IST" in flight_str or
-                "ISTANBUL" in flight_str
-            )
-            
-            if not has_ist:
-                print(f"      [{thread_id}] 🚫 Skipping flight not via IST: route {route}, stops {stops}")
+            if not is_valid(flight, thread_id):
                 continue
-            
-            print(f"      [{thread_id}] ✅ Valid Turkish Airlines flight via IST: route {route}")
-            valid_flights.append(flight)
+            valid_count += 1
+            price = parse_price(flight.get("price"))
+            if cheapest is None or price < cheapest_price:
+                cheapest, cheapest_price = flight, price
         
-        return valid_flights
+        return cheapest, cheapest_price, valid_count
 
 def main():
     print("🇹🇷 Turkish Airlines 1M Miles Challenge - Multi-Threaded Flight Search with Resume & Early Termination")
@@ -704,98 +1155,99 @@ def main():
     
     # Generate all possible route combinations for comprehensive analysis
     print("\n📋 Generating ALL possible route combinations...")
-    routes = generate_all_possible_combinations()
-    
-    # Show summary of generated routes
-    print(f"\n📊 Route Generation Summary:")
-    print(f"Total routes generated: {len(routes)}")
-    
-    # Group routes by continents for analysis
-    continent_combinations = {}
-    for route in routes:
-        unique_continents = list(dict.fromkeys([stop['continent'] for stop in route]))
-        continents = tuple(sorted(unique_continents))
-        continent_combinations[continents] = continent_combinations.get(continents, 0) + 1
     
-    print(f"Unique continent combinations: {len(continent_combinations)}")
+    # Score every combination and keep only the best-scoring candidates as route dicts
+    routes, route_stats = best_route_combinations(_MAX_SEARCH_CANDIDATES)
+    total_routes = route_stats["total"]
+    continent_combinations = route_stats["continent_combinations"]
     
-    # Count easy visa routes
-    all_easy_visa_routes = [r for r in routes if all(stop['easy_visa'] for stop in r)]
-    print(f"Routes with all easy visa countries: {len(all_easy_visa_routes)}")
+    # Route generation prints directly; from here on output goes through the queued logger
+    start_log_listener()
     
-    # Calculate optimal search parameters
-    total_routes = len(routes)
+    # Show summary of generated routes
+    logger.info(f"\n📊 Route Generation Summary:")
+    logger.info(f"Total routes generated: {total_routes}")
+    logger.info(f"Unique continent combinations: {len(continent_combinations)}")
+    logger.info(f"Routes with all easy visa countries: {route_stats['all_easy_visa']}")
     
     # Configuration for different scales
     if total_routes > 40000:
         # For very large datasets, process in manageable chunks
         max_routes_to_search = min(5000, total_routes)  # Process 5000 routes at a time
-        print(f"\n⚠️  Very large dataset detected ({total_routes:,} routes)")
-        print(f"📊 Processing in chunks of {max_routes_to_search} routes")
-        print(f"💡 Run multiple times to process all routes incrementally")
+        logger.info(f"\n⚠️  Very large dataset detected ({total_routes:,} routes)")
+        logger.info(f"📊 Processing in chunks of {max_routes_to_search} routes")
+        logger.info(f"💡 Run multiple times to process all routes incrementally")
     elif total_routes > 10000:
         max_routes_to_search = min(1000, total_routes)  # Medium batch size
-        print(f"\n⚠️  Large dataset detected ({total_routes:,} routes)")
-        print(f"� Processing {max_routes_to_search} routes in this run")
-        print(f"💡 Use resume capability for interrupted runs")
+        logger.info(f"\n⚠️  Large dataset detected ({total_routes:,} routes)")
+        logger.info(f"� Processing {max_routes_to_search} routes in this run")
+        logger.info(f"💡 Use resume capability for interrupted runs")
     else:
         max_routes_to_search = total_routes
     
     # Threading configuration - balance between speed and API rate limits
     max_workers = 8  # Increased for better parallelization
-    rate_limit_delay = 1.0  # Reduced delay for faster processing
-    
-    print(f"\n🔧 Multi-threading configuration:")
-    print(f"   • Max workers: {max_workers} threads")
-    print(f"   • Rate limit: {rate_limit_delay}s delay per thread")
-    print(f"   • Routes to search: {max_routes_to_search}")
-    print(f"   • Estimated time per route: ~{6 * rate_limit_delay}s")
-    print(f"   • Estimated total time: ~{(max_routes_to_search * 6 * rate_limit_delay) / max_workers / 60:.1f} minutes")
-    
-    print(f"\n💾 Resume capability:")
-    print(f"   • Progress file: flight_search_progress.json")
-    print(f"   • Results file: flight_search_results.json")
-    print(f"   • Automatic save after each completed route")
-    print(f"   • Resume from last position on restart")
-    
-    print(f"\n🚫 Early termination optimization:")
-    print(f"   • Routes discarded immediately if any segment lacks Turkish Airlines flights")
-    print(f"   • Significant time savings by avoiding useless route completion")
-    print(f"   • Only complete Turkish Airlines routes are saved as results")
+    requests_per_second = 8.0  # Combined request rate to Google Flights; does not scale with max_workers
+    rate_limit_delay = max_workers / requests_per_second  # Resulting average seconds between requests per thread
+    # One process-wide limiter, so adding workers does not raise the request rate
+    rate_limiter = TokenBucket(requests_per_second, _RATE_LIMIT_BURST)
+    
+    logger.info(f"\n🔧 Multi-threading configuration:")
+    logger.info(f"   • Max workers: {max_workers} threads")
+    logger.info(f"   • Rate limit: {rate_limiter.rate:.1f} requests/s shared by all threads (bursts of at most {rate_limiter.capacity})")
+    logger.info(f"   • Routes to search: {max_routes_to_search}")
+    logger.info(f"   • Estimated time per route: ~{6 * rate_limit_delay}s")
+    logger.info(f"   • Estimated total time: ~{(max_routes_to_search * 6 * rate_limit_delay) / max_workers / 60:.1f} minutes")
+    
+    logger.info(f"\n💾 Resume capability:")
+    logger.info(f"   • Progress file: flight_search_progress.json")
+    logger.info(f"   • Results file: flight_search_results.json (appended to flight_search_results.jsonl as routes complete)")
+    logger.info(f"   • Automatic save every 16 completed routes or 5 seconds")
+    logger.info(f"   • Segment cache: flight_segment_cache.json (searches reused across routes and runs for 10 minutes, empty ones for 1 minute)")
+    logger.info(f"   • Resume from last position on restart")
+    
+    logger.info(f"\n🚫 Early termination optimization:")
+    logger.info(f"   • Routes discarded immediately if any segment lacks Turkish Airlines flights")
+    logger.info(f"   • Significant time savings by avoiding useless route completion")
+    logger.info(f"   • Only complete Turkish Airlines routes are saved as results")
     
     # Initialize optimizer for multi-threaded search with resume capability
-    print("\n🔍 Starting multi-threaded flight search with resume capability...")
+    logger.info("\n🔍 Starting multi-threaded flight search with resume capability...")
     optimizer = TurkishAirlinesOptimizer(
         headless=True, 
         max_routes_to_search=max_routes_to_search,
         max_workers=max_workers,
         rate_limit_delay=rate_limit_delay,
+        rate_limiter=rate_limiter,
         progress_file="flight_search_progress.json",
         results_file="flight_search_results.json",
         departure_date=departure_date
     )
     
     # Search for flights
-    results = optimizer.search_all_routes(routes)
+    try:
+        results = optimizer.search_all_routes(routes)
+    finally:
+        optimizer.close()
     
     # Display results summary
     optimizer.print_summary(results)
     
-    print(f"\n✅ Multi-threaded search complete!")
-    print(f"📂 Results saved to: flight_search_results.json")
-    print(f"📂 Progress saved to: flight_search_progress.json")
-    print(f"🔄 To continue processing more routes, run the script again")
-    print(f"🚀 Resume capability ensures no work is lost!")
+    logger.info(f"\n✅ Multi-threaded search complete!")
+    logger.info(f"📂 Results saved to: flight_search_results.json")
+    logger.info(f"📂 Progress saved to: flight_search_progress.json")
+    logger.info(f"🔄 To continue processing more routes, run the script again")
+    logger.info(f"🚀 Resume capability ensures no work is lost!")
     
     # Show progress statistics
     total_completed = len(results)
     remaining = total_routes - total_completed
     if remaining > 0:
-        print(f"\n📊 Progress Statistics:")
-        print(f"   • Completed: {total_completed:,} routes")
-        print(f"   • Remaining: {remaining:,} routes")
-        print(f"   • Progress: {(total_completed/total_routes)*100:.1f}%")
-        print(f"   • Estimated time to complete all: ~{(remaining * 6 * rate_limit_delay) / max_workers / 3600:.1f} hours")
+        logger.info(f"\n📊 Progress Statistics:")
+        logger.info(f"   • Completed: {total_completed:,} routes")
+        logger.info(f"   • Remaining: {remaining:,} routes")
+        logger.info(f"   • Progress: {(total_completed/total_routes)*100:.1f}%")
+        logger.info(f"   • Estimated time to complete all: ~{(remaining * 6 * rate_limit_delay) / max_workers / 3600:.1f} hours")
 
 if __name__ == "__main__":
     main()
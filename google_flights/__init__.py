@@ -11,7 +11,8 @@ __version__ = '0.0.1'
 
 from playwright.sync_api import sync_playwright
 from selectolax.lexbor import LexborHTMLParser
+from .flight import Flight
 from .google_flights import GoogleFlights
 
 
-__all__ = ['GoogleFlights']
\ No newline at end of file
+__all__ = ['Flight', 'GoogleFlights']
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Flight record produced by GoogleFlights._process.
+"""
+
+from dataclasses import dataclass, fields
+
+
+@dataclass(frozen=True)
+class Flight:
+    """One flight result; immutable and hashable so duplicates can be dropped with a set"""
+    # Declared by hand (dataclass(slots=True) needs Python 3.10)
+    __slots__ = (
+        'departure_time', 'arrival_time', 'airline', 'duration', 'stops',
+        'emissions', 'emission_comparison', 'price', 'price_type', 'route',
+    )
+
+    departure_time: str
+    arrival_time: str
+    airline: str
+    duration: str
+    stops: str
+    emissions: str
+    emission_comparison: str
+    price: str
+    price_type: str
+    route: tuple  # Airport codes, origin first
+
+    def get(self, key, default=None):
+        """dict-style access, so code also handling flights loaded back from JSON works with both"""
+        return getattr(self, key, default)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a Flight from its JSON form (orjson serializes it as a plain object)"""
+        values = {field.name: data.get(field.name) for field in fields(cls)}
+        values['route'] = tuple(values['route'] or ())
+        return cls(**values)
@@ -5,186 +5,358 @@ Patched google_flights.py to:
 - Fixed Departure airport & date input
 - Add airline_filter to extract only Turkish Airlines results
 - Headless optional via init param
+- Keep one browser/context alive per instance instead of launching Chromium per search
+- Skip images, media, fonts and tracking requests
+- Wait for page events instead of fixed sleeps (no slow_mo)
+- Prepare the search page once and only change its inputs between searches
+- Return immutable Flight records (deduplicated) instead of a dict per flight
 """
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from selectolax.lexbor import LexborHTMLParser
-import time
+import logging
+
+from .flight import Flight
+
+logger = logging.getLogger(__name__)
+
+# CSS selectors used by _process, relative to the node they are applied to
+_CATEGORY = '.zBTtmb'
+_CATEGORY_RESULTS = '.Rk10dc'
+_RESULT = '.pIav2d'
+_MAIN = '.yR1fYc'
+_AIRPORTS = '.PTuQse.sSHqwe.tPgKwe.ogfYpf'
+_AIRPORT = '.QylvBf'
+_AIRLINE = '.Ir0Voe .sSHqwe'
+_TIMES = '[jscontroller="cNtv4b"] span'
+_DURATION = '.AdWm1c.gvkrdb'
+_STOPS = '.EfT7Ae .ogfYpf'
+_EMISSIONS = '.V1iAHe .AdWm1c'
+_EMISSION_COMPARISON = '.N6PNV'
+_PRICE = '.U3gSDe .FpEdX span'
+_PRICE_TYPE = '.U3gSDe .N872Rd'
+_STOP_AIRPORTS = '.BbR8Ec > .sSHqwe.tPgKwe.ogfYpf > span'
+
+# Requests the scraper never needs. Stylesheets stay: the visibility-based waits depend on layout.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+_BLOCKED_URL_PARTS = ("doubleclick", "google-analytics", "googletagmanager")
+
+
+# Scroll-loop waits: the "View more flights" button, and a page-side check for newly loaded results
+_VIEW_MORE = "button[aria-label='View more flights']"
+_MORE_RESULTS_JS = (
+    "n => document.querySelectorAll('.pIav2d').length > n"
+    " || (b => !!b && b.offsetParent !== null)(document.querySelector(\"button[aria-label='View more flights']\"))"
+)
+_AT_BOTTOM_JS = "() => window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 1"
+# Tags the results (and "No flights found" banner) on screen before a reused page searches again,
+# so stale ones are not mistaken for new ones
+_NO_FLIGHTS_XPATH = "//*[text()[contains(., 'No flights found')]]"
+_MARK_STALE_JS = """() => {
+    document.querySelectorAll('.pIav2d').forEach(e => e.setAttribute('data-stale', ''));
+    const banners = document.evaluate("%s", document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < banners.snapshotLength; i++) banners.snapshotItem(i).setAttribute('data-stale', '');
+}""" % _NO_FLIGHTS_XPATH
+# Resolves to "results" once fresh results are visible, or "empty" once a fresh "No flights found" shows
+_SEARCH_OUTCOME_JS = """() => {
+    const visible = e => !!e && e.offsetParent !== null;
+    if (visible(document.querySelector('.pIav2d:not([data-stale])'))) return 'results';
+    const banner = document.evaluate("%s[not(@data-stale)]", document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null);
+    return visible(banner.singleNodeValue) ? 'empty' : null;
+}""" % _NO_FLIGHTS_XPATH
+# _extract result for a search Google answered with "No flights found"; nothing to parse
+_NO_FLIGHTS_HTML = "<empty/>"
+
+
+def _settle(wait, *args, **kwargs):
+    """Run a Playwright wait in place of a fixed sleep; a timeout just means it is settled"""
+    try:
+        wait(*args, **kwargs)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def _block_unneeded(route):
+    """Playwright route handler that aborts images, media, fonts and tracking"""
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(part in request.url for part in _BLOCKED_URL_PARTS):
+        route.abort()
+    else:
+        route.continue_()
 
 class GoogleFlights:
     def __init__(self, headless=True, airline_filter=None, formatted_date="October 3, 2025"):
         self.headless = headless
         self.airline_filter = airline_filter
         self.formatted_date = formatted_date
+        # Started lazily on the first search; the sync API ties these to the creating thread
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._consent_checked = False
+        self._page = None  # Prepared search page, reused with new inputs for every search
 
-    def _extract(self, origin, destination, departure_date, passengers=1):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless, slow_mo=100)
-            page = browser.new_page()
+    def _ensure_context(self):
+        """Return the shared browser context, (re)launching Chromium if needed"""
+        if self._browser is None or not self._browser.is_connected():
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(
+                headless=self.headless,
+                args=["--disable-dev-shm-usage", "--no-sandbox", "--blink-settings=imagesEnabled=false"],
+            )
+            # One context per browser so cookies/consent survive between searches
+            self._context = self._browser.new_context()
+            self._context.route("**/*", _block_unneeded)
+            self._consent_checked = False
+        return self._context
 
-            try:
-                page.goto("https://www.google.com/travel/flights?hl=en&curr=INR")
+    def close(self):
+        """Close the browser and stop Playwright (call from the thread that searched)"""
+        self._page = None
+        try:
+            if self._browser is not None:
+                self._browser.close()
+        finally:
+            self._browser = None
+            self._context = None
+            if self._playwright is not None:
+                self._playwright.stop()
+                self._playwright = None
+
+    def _prepare_page(self):
+        """Open the search page once: load Google Flights, accept cookies, switch to one way"""
+        page = self._ensure_context().new_page()
+        try:
+            page.goto("https://www.google.com/travel/flights?hl=en&curr=INR")
 
-                # Accept cookies
+            # Accept cookies (once per context; the consent cookie covers later searches)
+            if not self._consent_checked:
                 try:
                     page.get_by_text("Accept all").click(timeout=5000)
                 except:
                     pass  # cookie popup might not show
+                self._consent_checked = True
+
+            # One-way trip
+            page.get_by_role("combobox", name="Change ticket type.").click()
+            one_way = page.get_by_role("option", name="One way")
+            one_way.click()
+            _settle(one_way.wait_for, state="hidden", timeout=2000)
+        except Exception:
+            page.close()
+            raise
+        self._page = page
+        return page
+
+    def _discard_page(self):
+        """Drop the prepared page so the next search starts from a fresh one"""
+        page, self._page = self._page, None
+        if page is not None:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def _run_query(self, page, origin, destination, departure_date):
+        """Change the inputs of a prepared page in place and return the hydrated results HTML"""
+        # Tag the results currently shown so only freshly rendered ones count below
+        page.evaluate(_MARK_STALE_JS)
+        results_selector = ".pIav2d"
+
+        # Passengers
+        # page.get_by_label("1 passenger").click()
+        # page.get_by_label("Add adult").click(click_count=passengers - 1)
+
+        # Origin (replace whatever the previous search left in the field)
+        page.get_by_label("Where from?").click()
+        page.keyboard.press("Control+A")
+        page.keyboard.press("Delete")
+        page.keyboard.insert_text(origin)
+        # page.type("input[aria-label^='Where']", origin, delay=1000)
+        page.wait_for_selector("span.yPKHsc", timeout=5000)
+        page.keyboard.press("ArrowDown")
+        page.keyboard.press("Enter")
+        _settle(page.wait_for_selector, "span.yPKHsc", state="hidden", timeout=2000)
 
-                # One-way trip
-                page.get_by_role("combobox", name="Change ticket type.").click()
-                time.sleep(0.4)
-                page.get_by_role("option", name="One way").click()
-
-                # Passengers
-                # page.get_by_label("1 passenger").click()
-                # page.get_by_label("Add adult").click(click_count=passengers - 1)
-
-                # Origin
-                page.get_by_label("Where from?").click()
-                page.keyboard.insert_text(origin)
-                # page.type("input[aria-label^='Where']", origin, delay=1000)
-                page.wait_for_selector("span.yPKHsc", timeout=5000)
-                page.keyboard.press("ArrowDown")
-                page.keyboard.press("Enter")
-                time.sleep(1)
-
-                # page.fill("input[aria-label='Where else?']", origin)
-                # page.keyboard.press("Enter")
-                # page.get_by_label("Where else?").fill(origin)
-                # page.get_by_label("Where else?").press("Enter")
-
-                # Destination
-                page.get_by_role("combobox", name="Where to?").click()
-                page.get_by_role("combobox", name="Where to?").fill(destination)
-                page.get_by_role("combobox", name="Where to?").press("Enter")
-                time.sleep(0.5)
-
-                # Date
-                page.get_by_role("textbox", name="Departure").click()
-                page.get_by_role("textbox", name="Departure").fill(departure_date)
-                page.get_by_role("textbox", name="Departure").press("Enter")
-                formatted_date = self.formatted_date
-                time.sleep(0.7)
-                # page.click("div:has-text('one way price')")
-                aria_label = f"Done. Search for one-way flights, departing on {formatted_date}"
-
-                # Wait and click the correct Done button
-                page.get_by_role("button", name=aria_label).wait_for(state="visible", timeout=5000)
-                page.get_by_role("button", name=aria_label).click()
-                # page.get_by_role("textbox", name="Departure").press("Done")
-                time.sleep(0.7)
-
-                # Search
-                # page.get_by_label("OK. Search one-way").click()
-                page.get_by_label("Search", exact=True).click()
-                time.sleep(3)
-
-                # Select Airlines
-                if self.airline_filter:
-                    # Open filters
-                    page.get_by_role("button", name="Airlines, Not selected").click()
-                    time.sleep(0.7)
-
-                    page.get_by_role("button", name=self.airline_filter).click()
-                    time.sleep(0.7)
-                    page.get_by_role("button", name=self.airline_filter + ' only').press("Enter")
-                    time.sleep(0.7)
-                
-
-                results_selector = ".pIav2d"
-                page.wait_for_selector(results_selector, state="visible", timeout=5000)
-
-                # Scroll and load all flight results
-                print("🔍 Scrolling to load more flight results...")
-                for _ in range(15):  # Adjust range for deeper pagination
-                    try:
-                        # Scroll down
-                        page.mouse.wheel(0, 1000)
-                        time.sleep(1)
-
-                        # Click "View more flights" if visible
-                        view_more_button = page.locator("button[aria-label='View more flights']").first
-                        if view_more_button.is_visible():
-                            print("🔄 Clicking 'View more flights' to load more results...")
-                            view_more_button.click()
-                            time.sleep(3)
-                    except Exception as e:
-                        print(f"⚠️  Scroll/View More Exception: {e}")
-                        continue
-
-                # Wait for any remaining JS rendering
-                time.sleep(3)
-
-                # Return hydrated HTML
-                return page.content()
+        # page.fill("input[aria-label='Where else?']", origin)
+        # page.keyboard.press("Enter")
+        # page.get_by_label("Where else?").fill(origin)
+        # page.get_by_label("Where else?").press("Enter")
 
+        # Destination
+        page.get_by_role("combobox", name="Where to?").click()
+        page.get_by_role("combobox", name="Where to?").fill(destination)
+        page.get_by_role("combobox", name="Where to?").press("Enter")
+        # The next click waits until no suggestion list covers the Departure box
+
+        # Date
+        page.get_by_role("textbox", name="Departure").click()
+        page.get_by_role("textbox", name="Departure").fill(departure_date)
+        page.get_by_role("textbox", name="Departure").press("Enter")
+        formatted_date = self.formatted_date
+        # page.click("div:has-text('one way price')")
+        aria_label = f"Done. Search for one-way flights, departing on {formatted_date}"
+
+        # Wait and click the correct Done button
+        done_button = page.get_by_role("button", name=aria_label)
+        done_button.wait_for(state="visible", timeout=5000)
+        done_button.click()
+        # page.get_by_role("textbox", name="Departure").press("Done")
+        _settle(done_button.wait_for, state="hidden", timeout=2000)
+
+        # Search (only the start page has the button; the results page searches on its own)
+        # page.get_by_label("OK. Search one-way").click()
+        search_button = page.get_by_label("Search", exact=True)
+        if search_button.is_visible():
+            search_button.click()
+        if self._search_outcome(page, timeout=10000) == "empty":
+            logger.info("🈳 No flights found")
+            return _NO_FLIGHTS_HTML
+
+        # Select Airlines (each click waits for its button to be actionable); a filter
+        # applied by an earlier search on this page is kept by Google Flights
+        if self.airline_filter:
+            airlines_button = page.get_by_role("button", name="Airlines, Not selected")
+            if airlines_button.is_visible():
+                # Open filters
+                page.evaluate(_MARK_STALE_JS)
+                airlines_button.click()
+                page.get_by_role("button", name=self.airline_filter).click()
+                page.get_by_role("button", name=self.airline_filter + ' only').press("Enter")
+                # Let the filtered results replace the unfiltered ones
+                _settle(page.wait_for_load_state, "networkidle", timeout=3000)
+
+        if page.wait_for_function(_SEARCH_OUTCOME_JS, timeout=5000).json_value() == "empty":
+            logger.info(f"🈳 No {self.airline_filter} flights found")
+            return _NO_FLIGHTS_HTML
+
+        # Scroll and load all flight results
+        logger.info("🔍 Scrolling to load more flight results...")
+        view_more_button = page.locator(_VIEW_MORE).first
+        for _ in range(15):  # Adjust range for deeper pagination
+            try:
+                # Scroll down, then wait until more results or the "View more flights" button show up
+                result_count = page.locator(results_selector).count()
+                page.mouse.wheel(0, 1000)
+                if not _settle(page.wait_for_function, _MORE_RESULTS_JS, arg=result_count, timeout=1000):
+                    if page.evaluate(_AT_BOTTOM_JS):
+                        break  # Bottom of the page and nothing left to load
+                    continue
+
+                # Click "View more flights" if visible
+                if view_more_button.is_visible():
+                    logger.info("🔄 Clicking 'View more flights' to load more results...")
+                    result_count = page.locator(results_selector).count()
+                    view_more_button.click()
+                    _settle(page.wait_for_function, _MORE_RESULTS_JS, arg=result_count, timeout=3000)
             except Exception as e:
-                print("Error during scraping:", e)
-                return None
-            finally:
-                browser.close()
+                logger.info(f"⚠️  Scroll/View More Exception: {e}")
+                continue
+
+        # Wait for any remaining JS rendering
+        _settle(page.wait_for_load_state, "networkidle", timeout=3000)
+
+        # Return hydrated HTML
+        return page.content()
+
+    def _search_outcome(self, page, timeout):
+        """Wait for fresh results or "No flights found"; returns "results", "empty" or None"""
+        try:
+            return page.wait_for_function(_SEARCH_OUTCOME_JS, timeout=timeout).json_value()
+        except PlaywrightTimeoutError:
+            return None
+
+    def _extract(self, origin, destination, departure_date, passengers=1):
+        try:
+            page = self._page if self._page is not None and not self._page.is_closed() else self._prepare_page()
+            return self._run_query(page, origin, destination, departure_date)
+        except Exception as e:
+            logger.error(f"Error during scraping: {e}")
+            # The page may be stuck in a dialog or half-updated; prepare a new one next time
+            self._discard_page()
+            return None
 
     def _parse(self, html):
         return LexborHTMLParser(html)
 
     def _process(self, parser):
         data = {}
-        categories = [parser.root.css_first('.zBTtmb')]
-        category_results = [parser.root.css_first('.Rk10dc')]
+        root = parser.root
+        if root.css_first(_RESULT) is None:
+            return data  # No result cards at all
+        # The airline filter is applied in the page; only double-check it when debugging
+        check_airline = bool(self.airline_filter) and logger.isEnabledFor(logging.DEBUG)
+        categories = [root.css_first(_CATEGORY)]
+        category_results = [root.css_first(_CATEGORY_RESULTS)]
 
         for category, category_result in zip(categories, category_results):
             category_data = []
-            for result in category_result.css('.pIav2d'):
-                main = result.css_first('.yR1fYc')
-                if not main or not main.css_first('.PTuQse.sSHqwe.tPgKwe.ogfYpf'):
+            seen = set()
+            for result in category_result.css(_RESULT):
+                main = result.css_first(_MAIN)
+                if not main:
                     continue
-
-                airline = main.css_first('.Ir0Voe .sSHqwe').text()
-                if self.airline_filter and self.airline_filter.lower() not in airline.lower():
+                # Look every node up once and reuse it
+                airports_node = main.css_first(_AIRPORTS)
+                if not airports_node:
                     continue
 
-                times = main.css('[jscontroller="cNtv4b"] span')
+                airline = main.css_first(_AIRLINE).text()
+                if check_airline and self.airline_filter.lower() not in airline.lower():
+                    logger.debug("Result not matching airline filter %r: %s", self.airline_filter, airline)
+
+                times = main.css(_TIMES)
                 departure_time = times[0].text() if times else None
-                arrival_time = times[1].text() if times and len(times) > 1 else None
-                duration = main.css_first('.AdWm1c.gvkrdb').text()
-                stops = main.css_first('.EfT7Ae .ogfYpf').text()
-                emissions = main.css_first('.V1iAHe .AdWm1c').text()
-                emission_comparison = (main.css_first('.N6PNV').text() if main.css_first('.N6PNV') else None)
-                price = main.css_first('.U3gSDe .FpEdX span').text()
-                price_type = (main.css_first('.U3gSDe .N872Rd').text() if main.css_first('.U3gSDe .N872Rd') else None)
-
-                airports_raw = main.css_first('.PTuQse.sSHqwe.tPgKwe.ogfYpf').css(".QylvBf")
+                arrival_time = times[1].text() if len(times) > 1 else None
+                duration = main.css_first(_DURATION).text()
+                stops = main.css_first(_STOPS).text()
+                emissions = main.css_first(_EMISSIONS).text()
+                emission_comparison_node = main.css_first(_EMISSION_COMPARISON)
+                emission_comparison = emission_comparison_node.text() if emission_comparison_node else None
+                price = main.css_first(_PRICE).text()
+                price_type_node = main.css_first(_PRICE_TYPE)
+                price_type = price_type_node.text() if price_type_node else None
+
+                airports_raw = airports_node.css(_AIRPORT)
                 departure_airport = airports_raw[0].text()[:3]
                 arrival_airport = airports_raw[-1].text()[:3]
-                route = [departure_airport, arrival_airport]
+                route = (departure_airport, arrival_airport)
 
                 if stops != "Nonstop":
-                    stop_airports = main.css('.BbR8Ec > .sSHqwe.tPgKwe.ogfYpf > span')
+                    stop_airports = main.css(_STOP_AIRPORTS)
                     if stop_airports:
-                        route[1:1] = [s.text()[:3] for s in stop_airports]
-
-                flight_data = {
-                    'departure_time': departure_time,
-                    'arrival_time': arrival_time,
-                    'airline': airline,
-                    'duration': duration,
-                    'stops': stops,
-                    'emissions': emissions,
-                    'emission_comparison': emission_comparison,
-                    'price': price,
-                    'price_type': price_type,
-                    'route': route
-                }
+                        route = (departure_airport, *(s.text()[:3] for s in stop_airports), arrival_airport)
 
+                flight_data = Flight(
+                    departure_time=departure_time,
+                    arrival_time=arrival_time,
+                    airline=airline,
+                    duration=duration,
+                    stops=stops,
+                    emissions=emissions,
+                    emission_comparison=emission_comparison,
+                    price=price,
+                    price_type=price_type,
+                    route=route,
+                )
+
+                # "View more flights" can render a result twice
+                if flight_data in seen:
+                    continue
+                seen.add(flight_data)
                 category_data.append(flight_data)
             if category:
                 data[category.text().lower().replace(' ', '_')] = category_data
         return data
 
     def search(self, origin, destination, departure_date, passengers=1):
+        """Flights by category; {} when Google has none, None when scraping failed"""
         html = self._extract(origin, destination, departure_date, passengers)
-        if not html:
+        if html is None:
+            return None
+        if html == _NO_FLIGHTS_HTML:
             return {}
         parser = self._parse(html)
         return self._process(parser)
\ No newline at end of file
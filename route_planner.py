@@ -1,46 +1,66 @@
 from itertools import product, combinations
 from utils import get_eligible_country_list, COUNTRY_MAJOR_CITIES, EASY_VISA_COUNTRIES, REQUIRED_CONTINENTS
+from array import array
+from collections import Counter, namedtuple
+from types import MappingProxyType
+import functools
+import heapq
+import math
 import random
 
 NUM_CONTINENTS = 6
 MAX_ROUTES = 4000  # Generate many more route options for comprehensive analysis
 EASY_VISA_WEIGHT = 10  # Priority multiplier for easy visa countries
 
+# One candidate city; immutable so the cached mapping can be shared safely
+City = namedtuple("City", ["country_code", "city", "easy_visa"])
+
+@functools.lru_cache(maxsize=1)
 def get_continent_city_mapping():
-    """Map eligible countries to their continents and cities - ONLY easy visa countries"""
+    """Map eligible countries to their continents and cities - ONLY easy visa countries.
+    
+    Computed once per process and shared by every caller, so it is returned as a
+    read-only view; each continent maps to a tuple of City entries.
+    """
     eligible_countries = get_eligible_country_list()
     continent_cities = {}
     
     for continent, country_codes in eligible_countries.items():
-        continent_cities[continent] = []
-        for country_code in country_codes:
+        continent_cities[continent] = tuple(
+            City(country_code=country_code, city=city, easy_visa=True)  # All countries are easy visa now
+            for country_code in country_codes
             # Only include countries that are in EASY_VISA_COUNTRIES
-            if country_code in EASY_VISA_COUNTRIES and country_code in COUNTRY_MAJOR_CITIES:
-                cities = COUNTRY_MAJOR_CITIES[country_code]
-                for city in cities:
-                    continent_cities[continent].append({
-                        "country_code": country_code,
-                        "city": city,
-                        "easy_visa": True  # All countries are easy visa now
-                    })
-    
-    return continent_cities
-
-def calculate_route_score(route):
-    """Calculate route score based on priorities: visa ease, cost estimates"""
-    score = 0
+            if country_code in EASY_VISA_COUNTRIES and country_code in COUNTRY_MAJOR_CITIES
+            for city in COUNTRY_MAJOR_CITIES[country_code]
+        )
     
+    return MappingProxyType(continent_cities)
+
+def total_route_combinations():
+    """Number of routes with one city per continent"""
+    return math.prod(len(cities) for cities in get_continent_city_mapping().values())
+
+def _score(easy_visa_count, country_count, stop_count):
+    """Route score from its easy visa stop count and distinct country count"""
     # Prioritize easy visa countries (most important after cost)
-    easy_visa_count = sum(1 for stop in route if stop["easy_visa"])
-    score += easy_visa_count * EASY_VISA_WEIGHT
+    score = easy_visa_count * EASY_VISA_WEIGHT
     
     # Prefer fewer countries with multiple cities (potentially cheaper connections)
-    countries = set(stop["country_code"] for stop in route)
-    if len(countries) < len(route):
+    if country_count < stop_count:
         score += 5
     
     return score
 
+def calculate_route_score(route):
+    """Calculate route score based on priorities: visa ease, cost estimates"""
+    easy_visa_count = sum(1 for stop in route if stop["easy_visa"])
+    countries = set(stop["country_code"] for stop in route)
+    return _score(easy_visa_count, len(countries), len(route))
+
+def route_priority(route):
+    """Ascending sort key for routes (negated score), for use with heapq.nsmallest"""
+    return -calculate_route_score(route)
+
 def generate_optimal_routes():
     """Generate routes visiting all 6 continents with priority on visa ease and cost"""
     continent_cities = get_continent_city_mapping()
@@ -55,90 +75,43 @@ def generate_optimal_routes():
     print(f"\n📊 Available cities per continent (Easy Visa only):")
     for continent in available_continents:
         cities_count = len(continent_cities[continent])
-        sample_cities = [city['city'] for city in continent_cities[continent][:3]]
+        sample_cities = [city.city for city in continent_cities[continent][:3]]
         print(f"  {continent}: {cities_count} cities (e.g., {', '.join(sample_cities)}{'...' if cities_count > 3 else ''})")
     
-    all_routes = []
+    # Sort each continent's cities once so a combination index always means the same route
+    continent_city_lists = [
+        sorted(continent_cities[continent], key=lambda x: (x.city, x.country_code))
+        for continent in available_continents
+    ]
+    radices = [len(cities) for cities in continent_city_lists]
+    total_combinations = math.prod(radices)
+    
+    # Sample distinct combination indices directly - no rejected attempts, no dedup pass
+    rng = random.Random(0)  # Own generator so sampling is reproducible without touching global state
+    sampled = rng.sample(range(total_combinations), min(MAX_ROUTES, total_combinations))
     
-    # Generate systematic combinations for better coverage
-    # Use a completely deterministic approach
-    for attempt in range(MAX_ROUTES * 2):  # More attempts to get diverse routes
+    routes = []
+    for combo_index in sampled:
         route = []
-        used_continents = set()
-        
-        # Shuffle continents deterministically based on attempt number
-        continents = available_continents.copy()
-        random.seed(attempt)  # Use attempt number as seed for reproducible variety
-        random.shuffle(continents)
-        # DO NOT reset seed - keep it deterministic
-        
-        for continent in continents[:NUM_CONTINENTS]:
-            if continent in used_continents:
-                continue
-                
-            # Get cities for this continent
-            cities = continent_cities[continent].copy()
-            
-            if not cities:
-                continue
-            
-            # For better diversity, cycle through different selection strategies
-            selection_strategy = attempt % 4
-            
-            if selection_strategy == 0:
-                # Strategy 1: Deterministic based on attempt
-                selected_city = cities[attempt % len(cities)]
-            elif selection_strategy == 1:
-                # Strategy 2: Prefer first cities alphabetically (different pattern)
-                cities.sort(key=lambda x: x['city'])
-                selected_city = cities[attempt % len(cities)]
-            elif selection_strategy == 2:
-                # Strategy 3: Prefer cities by country code
-                cities.sort(key=lambda x: x['country_code'])
-                selected_city = cities[attempt % len(cities)]
-            else:
-                # Strategy 4: Mixed approach
-                if len(cities) > 1:
-                    # Pick from first half or second half alternately
-                    half = len(cities) // 2
-                    if attempt % 2 == 0 and half > 0:
-                        selected_city = cities[(attempt // 2) % half]
-                    else:
-                        start_idx = half if half > 0 else 0
-                        available_cities = cities[start_idx:] if half > 0 else cities
-                        selected_city = available_cities[attempt % len(available_cities)]
-                else:
-                    selected_city = cities[0]
-            
+        # Decode the mixed-radix index into one city per continent
+        for continent, cities, radix in zip(available_continents, continent_city_lists, radices):
+            combo_index, city_index = divmod(combo_index, radix)
+            selected_city = cities[city_index]
             route.append({
                 "continent": continent,
-                "country_code": selected_city["country_code"],
-                "city": selected_city["city"],
-                "easy_visa": selected_city["easy_visa"]
+                "country_code": selected_city.country_code,
+                "city": selected_city.city,
+                "easy_visa": selected_city.easy_visa
             })
-            used_continents.add(continent)
-        
-        # Only keep routes that visit all 6 continents
-        if len(route) == NUM_CONTINENTS:
-            all_routes.append(route)
-    
-    # Remove duplicates more efficiently
-    unique_routes = []
-    seen_routes = set()
-    
-    for route in all_routes:
-        # Create a signature for deduplication
-        route_sig = tuple(sorted([(stop["continent"], stop["city"], stop["country_code"]) for stop in route]))
-        if route_sig not in seen_routes:
-            seen_routes.add(route_sig)
-            unique_routes.append(route)
+        rng.shuffle(route)  # Vary the continent visiting order reproducibly
+        routes.append(route)
     
-    # Sort by score (higher is better) but keep more variety
-    unique_routes.sort(key=calculate_route_score, reverse=True)
+    # Sort by score (higher is better)
+    routes.sort(key=calculate_route_score, reverse=True)
     
-    print(f"\n📈 Generated {len(unique_routes)} unique routes from {len(all_routes)} total attempts")
+    print(f"\n📈 Sampled {len(routes)} distinct routes from {total_combinations:,} possible combinations")
     
-    return unique_routes[:MAX_ROUTES]
+    return routes
 
 def print_route_summary(routes):
     """Print summary of generated routes"""
@@ -161,8 +134,8 @@ def print_route_summary(routes):
         if i % 10 == 0 and i < len(routes):
             print("\n" + "-"*60)
 
-def generate_all_possible_combinations():
-    """Generate ALL possible route combinations visiting 6 continents with easy visa countries"""
+def _prepare_combinations():
+    """Return (continent order, city list per continent, total combinations), printing a summary"""
     continent_cities = get_continent_city_mapping()
     
     # Ensure we have all required continents
@@ -176,47 +149,115 @@ def generate_all_possible_combinations():
     for continent in available_continents:
         count = len(continent_cities[continent])
         city_counts[continent] = count
-        sample_cities = [city['city'] for city in continent_cities[continent][:3]]
+        sample_cities = [city.city for city in continent_cities[continent][:3]]
         print(f"  {continent}: {count} cities (e.g., {', '.join(sample_cities)}{'...' if count > 3 else ''})")
     
     # Calculate total combinations
-    total_combinations = 1
-    for count in city_counts.values():
-        total_combinations *= count
+    total_combinations = math.prod(city_counts.values())
     print(f"\n🔢 Total possible combinations: {total_combinations:,}")
     
     if total_combinations > 100000:  # If too many combinations
         print(f"⚠️  Warning: {total_combinations:,} combinations is very large!")
         print("Consider limiting to top cities per continent or using sampling approach.")
-        return generate_optimal_routes()  # Fall back to current approach
     
-    # Generate all combinations using itertools.product
-    continent_city_lists = []
-    continent_order = []
+    continent_order = list(available_continents)
+    continent_city_lists = [continent_cities[continent] for continent in continent_order]
+    return continent_order, continent_city_lists, total_combinations
+
+def _route_from_combination(continent_order, combination):
+    """Build the route dicts for one city per continent"""
+    return [
+        {
+            "continent": continent,
+            "country_code": city_info.country_code,
+            "city": city_info.city,
+            "easy_visa": city_info.easy_visa
+        }
+        for continent, city_info in zip(continent_order, combination)
+    ]
+
+def generate_all_possible_combinations():
+    """Lazily yield ALL possible route combinations visiting 6 continents with easy visa countries.
     
-    for continent in available_continents:
-        continent_city_lists.append(continent_cities[continent])
-        continent_order.append(continent)
+    Routes come out in enumeration order, not by score; use
+    heapq.nsmallest(k, ..., key=route_priority) to pick the best k without
+    materializing every route, or best_route_combinations(k) to also skip
+    building the route dicts that do not make the cut.
+    """
+    continent_order, continent_city_lists, total_combinations = _prepare_combinations()
+    
+    if total_combinations > 100000:
+        yield from generate_optimal_routes()  # Fall back to current approach
+        return
     
     print(f"🔄 Generating all {total_combinations:,} combinations...")
     
-    all_routes = []
+    generated = 0
     for combination in product(*continent_city_lists):
-        route = []
-        for i, city_info in enumerate(combination):
-            route.append({
-                "continent": continent_order[i],
-                "country_code": city_info["country_code"],
-                "city": city_info["city"],
-                "easy_visa": city_info["easy_visa"]
-            })
-        all_routes.append(route)
+        generated += 1
+        yield _route_from_combination(continent_order, combination)
     
-    # Sort by score (higher is better)
-    all_routes.sort(key=calculate_route_score, reverse=True)
+    print(f"✅ Generated {generated:,} complete route combinations")
+
+def best_route_combinations(k):
+    """Return (best k routes by score, stats) over all combinations, like
+    heapq.nsmallest(k, generate_all_possible_combinations(), key=route_priority).
+    
+    Combinations are scored on compact (easy_visa, country_code) tuples and route
+    dicts are only built for the k winners. stats holds the number of routes
+    considered ("total"), how many are all easy visa ("all_easy_visa") and a
+    Counter of their sorted continent sets ("continent_combinations").
+    """
+    continent_order, continent_city_lists, total_combinations = _prepare_combinations()
+    
+    if total_combinations > 100000:
+        # Sampled routes are few enough to score as dicts
+        routes = generate_optimal_routes()
+        stats = {
+            "total": len(routes),
+            "all_easy_visa": sum(1 for route in routes if all(stop["easy_visa"] for stop in route)),
+            "continent_combinations": Counter(tuple(sorted(set(stop["continent"] for stop in route))) for route in routes),
+        }
+        return heapq.nsmallest(k, routes, key=route_priority), stats
+    
+    print(f"🔄 Scoring all {total_combinations:,} combinations...")
+    
+    # One (easy visa, country code) pair per city; combinations are never stored, only scored
+    compact_lists = [
+        [(city_info.easy_visa, city_info.country_code) for city_info in cities]
+        for cities in continent_city_lists
+    ]
+    stop_count = len(continent_order)
+    easy_visa_counts = Counter()
     
-    print(f"✅ Generated {len(all_routes):,} complete route combinations")
-    return all_routes
+    def priority(combination):
+        easy_visa_count = sum(easy for easy, _ in combination)
+        easy_visa_counts[easy_visa_count] += 1
+        # Negated so nsmallest keeps enumeration order among ties, as with route_priority
+        return -_score(easy_visa_count, len({code for _, code in combination}), stop_count)
+    
+    # One signed int per combination, in itertools.product (row-major) order;
+    # 'i' rather than 'b' so any EASY_VISA_WEIGHT or stop count fits
+    priorities = array('i', map(priority, product(*compact_lists)))
+    all_easy_visa = easy_visa_counts[stop_count]
+    
+    radices = [len(cities) for cities in continent_city_lists]
+    routes = []
+    for combo_index in heapq.nsmallest(k, range(len(priorities)), key=priorities.__getitem__):
+        # Decode the row-major product index back into one city per continent
+        combination = []
+        for cities, radix in zip(reversed(continent_city_lists), reversed(radices)):
+            combo_index, city_index = divmod(combo_index, radix)
+            combination.append(cities[city_index])
+        routes.append(_route_from_combination(continent_order, reversed(combination)))
+    
+    stats = {
+        "total": len(priorities),
+        "all_easy_visa": all_easy_visa,
+        "continent_combinations": Counter({tuple(sorted(continent_order)): len(priorities)}),
+    }
+    print(f"✅ Scored {len(priorities):,} complete route combinations")
+    return routes, stats
 
 
 
@@ -227,20 +268,17 @@ if __name__ == "__main__":
     print("="*90)
     
     # Test first to see if complete coverage is feasible
-    continent_cities = get_continent_city_mapping()
-    total_combinations = 1
-    for continent, cities in continent_cities.items():
-        total_combinations *= len(cities)
+    total_combinations = total_route_combinations()
     
     if total_combinations <= 100000:  # Reasonable limit
         print(f"\n💡 Complete coverage is feasible ({total_combinations:,} combinations)")
         print("\n🔄 COMPLETE COVERAGE - ALL COMBINATIONS:")
         print("-" * 50)
-        ALL_COMBINATIONS = generate_all_possible_combinations()
-        print_route_summary(ALL_COMBINATIONS[:10])  # Show first 10
+        TOP_COMBINATIONS = heapq.nsmallest(10, generate_all_possible_combinations(), key=route_priority)
+        print_route_summary(TOP_COMBINATIONS)  # Show first 10
         
         print(f"\n📊 COMPLETE COVERAGE SUMMARY:")
-        print(f"All standard routes: {len(ALL_COMBINATIONS):,}")
+        print(f"All standard routes: {total_combinations:,}")
         
     else:
         print(f"\n⚠️  Complete coverage not feasible ({total_combinations:,} combinations)")
@@ -258,13 +296,10 @@ if __name__ == "__main__":
 
 else:
     # When imported, try complete coverage first, fall back to sampling
-    continent_cities = get_continent_city_mapping()
-    total_combinations = 1
-    for continent, cities in continent_cities.items():
-        total_combinations *= len(cities)
+    total_combinations = total_route_combinations()
     
     if total_combinations <= 100000:
-        ITINERARIES = generate_all_possible_combinations()
+        ITINERARIES, _ = best_route_combinations(MAX_ROUTES)
         print_route_summary(ITINERARIES[:5])
     else:
         ITINERARIES = generate_optimal_routes()